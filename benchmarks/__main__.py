@@ -0,0 +1,135 @@
+"""Run the regression benchmarks in benchmarks/suite.py, reporting throughput and peak memory.
+
+Results can be saved as a baseline JSON file and later runs compared against it, failing if any benchmark's
+throughput has dropped by more than the tolerance:
+
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json
+
+Peak memory is the peak of what tracemalloc traces (which includes NumPy's arrays) during one extra run.
+The other scripts in this folder compare implementations rather than catching regressions, and are run on their own
+(e.g. `python -m benchmarks.propagate`).
+"""
+
+import argparse
+from itertools import product
+import json
+import sys
+import time
+import tracemalloc
+
+from benchmarks import suite
+
+
+BENCHMARKS = [suite.Propagate, suite.PropagateBatch, suite.Selection, suite.Repopulate, suite.Simulate, suite.SaveLoad]
+
+
+def combinations(benchmark: type, sizes: list[int], structures: list[str]) -> list[tuple]:
+    """Return the benchmark's combinations of params whose size and structure (if it has them) are among those given."""
+
+    params = [benchmark.params] if len(benchmark.param_names) == 1 else benchmark.params
+    chosen = []
+    for combination in product(*params):
+        named = dict(zip(benchmark.param_names, combination))
+        if named.get('size', sizes[0]) in sizes and named.get('structure', structures[0]) in structures:
+            chosen.append(combination)
+
+    return chosen
+
+
+def measure(instance: object, method: str, combination: tuple, repeat: int, max_seconds: float) -> tuple[float, int]:
+    """Return the best time of up to repeat calls of the method (stopping once they've taken max_seconds) and the peak memory of one more."""
+
+    function = getattr(instance, method)
+    times = []
+    start = time.perf_counter()
+    while len(times) < repeat and (not times or time.perf_counter() - start < max_seconds):
+        call_start = time.perf_counter()
+        function(*combination)
+        times.append(time.perf_counter() - call_start)
+
+    tracemalloc.start()
+    function(*combination)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return min(times), peak
+
+
+def run(names: list[str] | None, sizes: list[int], structures: list[str], repeat: int, max_seconds: float) -> dict[str, dict]:
+    """Run every chosen benchmark, printing and returning the results of each by name."""
+
+    results = dict()
+    for benchmark in BENCHMARKS:
+        if names and benchmark.__name__ not in names:
+            continue
+
+        for combination in combinations(benchmark, sizes, structures):
+            instance = benchmark()
+            arguments = ', '.join(f'{name}={value}' for name, value in zip(benchmark.param_names, combination))
+            try:
+                instance.setup(*combination)
+            except NotImplementedError as skipped:
+                print(f'{benchmark.__name__}({arguments}): skipped, {skipped}')
+                continue
+
+            try:
+                for method in [method for method in dir(benchmark) if method.startswith('time_')]:
+                    seconds, peak = measure(instance, method, combination, repeat, max_seconds)
+                    name = f'{benchmark.__name__}.{method[5:]}({arguments})'
+                    results[name] = {'seconds': seconds, 'throughput': instance.ITEMS / seconds, 'peak_memory': peak}
+                    print(f'{name}: {instance.ITEMS / seconds:,.0f}/s, {seconds * 1e3:.2f} ms, peak {peak / 2**20:.1f} MiB')
+            finally:
+                if hasattr(instance, 'teardown'):
+                    instance.teardown(*combination)
+
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """Print the change in throughput and peak memory of every result in the baseline and return the names of those that regressed."""
+
+    regressions = []
+    print(f'\ncompared to baseline (tolerance {tolerance:.0%}):')
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        speed = result['throughput'] / baseline[name]['throughput']
+        memory = result['peak_memory'] / max(baseline[name]['peak_memory'], 1)
+        regressed = speed < 1 - tolerance
+        if regressed:
+            regressions.append(name)
+        print(f'  {name}: {speed:.2f}x throughput, {memory:.2f}x peak memory{"  REGRESSION" if regressed else ""}')
+
+    return regressions
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Run the regression benchmarks.')
+    parser.add_argument('names', nargs='*', help='benchmarks to run (default all): ' + ', '.join(benchmark.__name__ for benchmark in BENCHMARKS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000, 10_000], help=f'population sizes out of {suite.SIZES}')
+    parser.add_argument('--structures', nargs='+', default=list(suite.STRUCTURES), choices=list(suite.STRUCTURES))
+    parser.add_argument('--repeat', type=int, default=5, help='most times to run each benchmark, keeping the best')
+    parser.add_argument('--max-seconds', type=float, default=2.0, help='stop repeating a benchmark once it has taken this long')
+    parser.add_argument('--save', help='save the results to this JSON file')
+    parser.add_argument('--compare', help='compare the results to those saved in this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='fraction of throughput that can be lost before failing a comparison')
+    args = parser.parse_args()
+
+    results = run(args.names, args.sizes, args.structures, args.repeat, args.max_seconds)
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
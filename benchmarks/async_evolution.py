@@ -0,0 +1,79 @@
+"""Benchmark of simulation throughput with generational versus asynchronous evolution.
+
+Simulations take a random, heavy tailed amount of time (as when some players survive far longer than others), so every
+generation of the generational loop waits on its slowest simulation while AsyncEvolution keeps every worker busy.
+AsyncEvolution sends Genomes one at a time, so its gain shrinks as simulations get cheaper relative to that overhead.
+Run with `python -m benchmarks.async_evolution`.
+"""
+
+import time
+from typing import Any
+
+import numpy as np
+
+from genetic_algorithm import Population, BasePlayer, Evaluator
+from genetic_algorithm.async_evolution import AsyncEvolution
+
+
+STRUCTURE = ((8,), (8, 'relu'), (2, 'softmax'))
+
+
+class SleepyPlayer(BasePlayer):
+    """Player whose simulation just sleeps for a time drawn from a heavy tailed distribution."""
+
+    def __init__(self) -> None:
+        self.score = 0
+        self.fitness = 0
+        self.best_score = 0
+
+    def look(self) -> None:
+        pass
+
+    def think(self) -> Any:
+        return self.genome.propagate(np.ones(STRUCTURE[0][0]))
+
+    def move(self, move: Any) -> None:
+        pass
+
+    @property
+    def is_dead(self) -> bool:
+        return True
+
+    def start_state(self) -> None:
+        self.score = 0
+
+
+def simulate(player: SleepyPlayer) -> SleepyPlayer:
+    time.sleep(min(np.random.pareto(2) * 0.01, 0.25))
+    player.score = player.best_score = 1
+    player.fitness = float(player.think()[0]) + 1
+    return player
+
+
+def main(population_size: int = 200, generations: int = 10, processes: int = 4) -> None:
+
+    evaluations = population_size * generations
+    with Evaluator(SleepyPlayer, simulate, processes) as evaluator:
+
+        population = Population(population_size, [SleepyPlayer() for _ in range(population_size)])
+        population.new_genomes(STRUCTURE)
+        start = time.perf_counter()
+        for _ in range(generations):
+            evaluator.evaluate(population)
+            population.cull(0.2)
+            population.repopulate('uniform', 'gaussian', 0.05)
+        generational = evaluations / (time.perf_counter() - start)
+
+        population = Population(population_size, [SleepyPlayer() for _ in range(population_size)])
+        population.new_genomes(STRUCTURE)
+        evaluator.evaluate(population)
+        evolution = AsyncEvolution(population, evaluator, 'uniform', 'gaussian', 0.05)
+        evolution.run(evaluations)
+
+    print(f'{evaluations} evaluations on {processes} processes')
+    print(f'  generational: {generational:.0f} evaluations/s')
+    print(f'  asynchronous: {evolution.evaluations_per_second:.0f} evaluations/s ({evolution.evaluations_per_second / generational:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark of the per-pair cost of crossover.
+
+Compares the original deepcopy based crossovers against the current per-Genome and batched ones.
+Run with `python -m benchmarks.crossover`.
+"""
+
+from copy import deepcopy
+import timeit
+from typing import Callable
+
+import numpy as np
+
+from genetic_algorithm import Genome
+from genetic_algorithm.evolution.crossover import crossover_by_name, batch_crossover_by_name
+
+
+STRUCTURE = ((24,), (16, 'sigmoid'), (3, 'softmax'))
+CROSSOVER_TYPES = ['one-point', 'two-point', 'biased-uniform', 'uniform', 'layer', 'blend']
+
+
+def original_crossover(parent1: Genome, parent2: Genome, gen: int, biased: bool) -> tuple[Genome, Genome]:
+    """Cross over two Genomes the way the original 'one-point' (biased) and 'uniform' crossovers did."""
+
+    offspring1 = deepcopy(parent1)
+    offspring2 = deepcopy(parent2)
+    offspring1.birth_gen = offspring2.birth_gen = gen
+
+    crossover_rate = np.random.uniform(0,1) if biased else 0.5
+    for i, (l1, l2) in enumerate(zip(parent1.layers, parent2.layers)):
+
+        weights_mask = np.random.uniform(0, 1, size=l1.weights.shape)
+        offspring1.layers[i].weights[weights_mask > crossover_rate] = l2.weights[weights_mask > crossover_rate]
+        offspring2.layers[i].weights[weights_mask > crossover_rate] = l1.weights[weights_mask > crossover_rate]
+
+        bias_mask = np.random.uniform(0, 1, size=l1.bias.shape)
+        offspring1.layers[i].bias[bias_mask > crossover_rate] = l2.bias[bias_mask > crossover_rate]
+        offspring2.layers[i].bias[bias_mask > crossover_rate] = l1.bias[bias_mask > crossover_rate]
+
+    return offspring1, offspring2
+
+
+def per_pair(function: Callable[[], None], pairs: int, number: int) -> float:
+    """Return the best time per pair of calling function (which crosses over pairs pairs) over several repeats."""
+
+    return min(timeit.repeat(function, number=number, repeat=5)) / (number * pairs)
+
+
+def main(pairs: int = 1000, number: int = 2000) -> None:
+
+    parent1, parent2 = Genome.new(1, STRUCTURE), Genome.new(1, STRUCTURE)
+    count = len(parent1.parameters)
+    parents1, parents2 = np.random.uniform(-1, 1, (pairs, count)), np.random.uniform(-1, 1, (pairs, count))
+    out1, out2 = np.empty_like(parents1), np.empty_like(parents2)
+
+    print(f'structure: {STRUCTURE}, {count} parameters')
+    print(f'  original biased ("one-point"): {per_pair(lambda: original_crossover(parent1, parent2, 2, True), 1, number) * 1e6:.2f} us/pair')
+    print(f'  original uniform:              {per_pair(lambda: original_crossover(parent1, parent2, 2, False), 1, number) * 1e6:.2f} us/pair')
+
+    for crossover_type in CROSSOVER_TYPES:
+        crossover = crossover_by_name(crossover_type)
+        batch_crossover = batch_crossover_by_name(crossover_type)
+        single = per_pair(lambda: crossover(parent1, parent2, 2), 1, number)
+        batched = per_pair(lambda: batch_crossover(parents1, parents2, out1, out2, STRUCTURE), pairs, max(1, number // pairs))
+        print(f'  {crossover_type + ":":15} {single * 1e6:.2f} us/pair, batched {batched * 1e6:.2f} us/pair')
+
+
+if __name__ == '__main__':
+    main()
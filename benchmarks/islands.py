@@ -0,0 +1,84 @@
+"""Benchmark of the time per generation of one Population versus the same number of players split into islands.
+
+The single Population simulates and breeds every player in one process, while the IslandModel spreads both across
+one process per island, so the speed-up is bounded by the number of cores.
+Run with `python -m benchmarks.islands`.
+"""
+
+import os
+import time
+from typing import Any
+
+import numpy as np
+
+from genetic_algorithm import Population, BasePlayer, IslandModel
+
+
+STRUCTURE = ((16,), (16, 'relu'), (4, 'softmax'))
+
+
+class WalkingPlayer(BasePlayer):
+    """Player that takes a fixed number of steps, each deciding its move by propagating its position through its Genome."""
+
+    def __init__(self) -> None:
+        self.score = 0
+        self.fitness = 0
+        self.best_score = 0
+
+    def look(self) -> None:
+        self.vision = np.full(STRUCTURE[0][0], self.steps / 100)
+
+    def think(self) -> Any:
+        return int(np.argmax(self.genome.propagate(self.vision)))
+
+    def move(self, move: Any) -> None:
+        self.score += move
+        self.steps += 1
+
+    @property
+    def is_dead(self) -> bool:
+        return self.steps >= 100
+
+    def start_state(self) -> None:
+        self.score = 0
+        self.steps = 0
+
+
+def simulate(player: WalkingPlayer) -> WalkingPlayer:
+    player.start_state()
+    while not player.is_dead:
+        player.look()
+        player.move(player.think())
+    player.best_score = player.score
+    player.fitness = float(player.score) + 1
+    return player
+
+
+def main(population_size: int = 800, generations: int = 5, islands: int | None = None) -> None:
+
+    islands = islands or os.cpu_count()
+    repopulate_args = {'crossover_type': 'uniform', 'mutation_type': 'gaussian', 'mutation_rate': 0.05}
+
+    population = Population(population_size, [WalkingPlayer() for _ in range(population_size)])
+    population.new_genomes(STRUCTURE)
+    start = time.perf_counter()
+    for generation in range(generations):
+        for player in population.players:
+            simulate(player)
+        if generation < generations - 1:
+            population.cull(0.2)
+            population.repopulate(**repopulate_args)
+    single = (time.perf_counter() - start) / generations
+
+    model = IslandModel(WalkingPlayer, simulate, STRUCTURE, islands, population_size // islands, 'ring', 2, 2, 0.2, **repopulate_args)
+    start = time.perf_counter()
+    model.run(generations)
+    island = (time.perf_counter() - start) / generations
+
+    print(f'{population_size} players, {os.cpu_count()} cores')
+    print(f'  one population: {single * 1e3:.0f} ms/generation')
+    print(f'  {islands} islands:     {island * 1e3:.0f} ms/generation ({single / island:.2f}x, including process start up)')
+
+
+if __name__ == '__main__':
+    main()
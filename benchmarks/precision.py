@@ -0,0 +1,86 @@
+"""Check that a champion's fitness survives saving its Genome in reduced precision, and compare file sizes and latency.
+
+Evolves a population of the regression suite's CorridorPlayers in float64, then saves its champion as float64, float32,
+float16 and int8 (quantized), loads each back (converting float16 back to float32, as Population.load would for a
+float32 population) and simulates it again. Exits with 1 if any champion's fitness has changed by more than the tolerance.
+Run with `python -m benchmarks.precision`.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+
+from genetic_algorithm import Genome, SerialExecutor
+from benchmarks.suite import STRUCTURES, CorridorPlayer, new_population, simulate
+
+
+#the dtype each saved dtype is loaded back in
+SAVED_DTYPES = {
+    'float64': None,
+    'float32': None,
+    'float16': np.float32,
+    'int8': None,
+}
+
+
+def evolve_champ(structure: tuple[tuple[int,str]], size: int, generations: int) -> tuple[Genome, float]:
+    """Return the champion of a float64 population evolved for the given number of generations, and its fitness."""
+
+    population = new_population(size, structure)
+    executor = SerialExecutor(CorridorPlayer, simulate)
+    for generation in range(generations):
+        if generation:
+            population.cull(0.2)
+            population.repopulate('uniform', 'gaussian', 0.05)
+        executor.evaluate(population)
+
+    return population.champ.genome, population.champ.fitness
+
+
+def resimulate(genome: Genome) -> float:
+    """Return the fitness of a CorridorPlayer simulated with the Genome."""
+
+    player = CorridorPlayer()
+    player.genome = genome
+    return simulate(player).fitness
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.precision', description='Check champions saved in reduced precision.')
+    parser.add_argument('--structures', nargs='+', default=list(STRUCTURES), choices=list(STRUCTURES))
+    parser.add_argument('--size', type=int, default=200, help='population size')
+    parser.add_argument('--generations', type=int, default=10)
+    parser.add_argument('--tolerance', type=float, default=0.05, help='fraction of the champion\'s fitness that can be lost')
+    args = parser.parse_args()
+
+    failed = False
+    for name in args.structures:
+        champ, fitness = evolve_champ(STRUCTURES[name], args.size, args.generations)
+        input = np.random.uniform(-1, 1, STRUCTURES[name][0][0])
+        print(f'structure: {name}, champion fitness {fitness:g}')
+
+        with tempfile.TemporaryDirectory() as folder_name:
+            for dtype, loaded_dtype in SAVED_DTYPES.items():
+                champ.save(dtype, folder_name, fitness, dtype)
+                genome, _ = Genome.load(f'{dtype}.npz', folder_name, dtype=loaded_dtype)
+                loaded_fitness = resimulate(genome)
+                latency = min(timeit.repeat(lambda: genome.propagate(input), number=1000, repeat=5)) / 1000
+                error = np.abs(genome.flat_parameters() - champ.flat_parameters()).max()
+
+                lost = (fitness - loaded_fitness) / fitness
+                failed |= lost > args.tolerance
+                print(f'  {dtype:>7}: {os.path.getsize(f"{folder_name}/{dtype}.npz") / 1024:8.1f} KiB, loaded as {genome.dtype}, '
+                      f'max error {error:.1e}, {latency * 1e6:6.2f} us/propagate, fitness {loaded_fitness:g}'
+                      f'{"  FAILED" if lost > args.tolerance else ""}')
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Microbenchmark of the per-call latency of Genome.propagate.
+
+Compares the allocation-free path against the previous implementation, which allocated a new dot result,
+biased array and activation array in every layer on every call, both with the original activation functions
+(whose softmax was O(n^2)) and with the current ones.
+Run with `python -m benchmarks.propagate`.
+"""
+
+import timeit
+from typing import Callable
+
+import numpy as np
+
+from genetic_algorithm import Genome
+from genetic_algorithm.activation_functions import activation_by_name, activation_name
+
+
+STRUCTURES = [
+    ((24,), (16, 'sigmoid'), (3, 'softmax')),
+    ((64,), (32, 'relu'), (32, 'relu'), (8, 'softmax')),
+    ((256,), (256, 'sigmoid'), (64, 'softmax')),
+]
+
+
+def original_activation(name: str) -> Callable[[np.ndarray], np.ndarray]:
+    """Return the activation function as it was implemented before being made batch-aware."""
+
+    match(name):
+        case 'sigmoid':
+            return lambda X: 1.0 / (1.0 + np.exp(-X))
+        case 'relu':
+            return lambda X: np.maximum(0, X)
+        case 'softmax':
+            return lambda X: np.array([1/sum(np.exp(np.subtract(X, _))) for _ in np.nditer(X)])
+        case _:
+            return activation_by_name(name)
+
+
+def allocating_propagate(genome: Genome, input: np.ndarray, activations: list[Callable[[np.ndarray], np.ndarray]]) -> np.ndarray:
+    """Feed forward the input the way Genome.propagate did before preallocated neurons."""
+
+    neurons = input
+    for layer, activation in zip(genome.layers, activations):
+        neurons = activation(np.add(np.dot(layer.weights, neurons), layer.bias))
+
+    return neurons
+
+
+def latency(function: Callable[[], np.ndarray], number: int) -> float:
+    """Return the best per-call time of function over several repeats."""
+
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main(number: int = 5000) -> None:
+
+    for structure in STRUCTURES:
+        genome = Genome.new(1, structure)
+        input = np.random.uniform(-1, 1, structure[0][0])
+        out = np.empty(structure[-1][0])
+        originals = [original_activation(activation_name(layer.activation)) for layer in genome.layers]
+        currents = [layer.activation for layer in genome.layers]
+        assert np.allclose(allocating_propagate(genome, input, originals), genome.propagate(input))
+
+        original = latency(lambda: allocating_propagate(genome, input, originals), number)
+        before = latency(lambda: allocating_propagate(genome, input, currents), number)
+        after = latency(lambda: genome.propagate(input), number)
+        after_out = latency(lambda: genome.propagate(input, out), number)
+
+        print(f'structure: {structure}')
+        print(f'  original:          {original * 1e6:.2f} us/call')
+        print(f'  allocating:        {before * 1e6:.2f} us/call ({original / before:.2f}x)')
+        print(f'  preallocated:      {after * 1e6:.2f} us/call ({original / after:.2f}x)')
+        print(f'  preallocated, out: {after_out * 1e6:.2f} us/call ({original / after_out:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
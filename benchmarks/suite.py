@@ -0,0 +1,211 @@
+"""Regression benchmarks of inference, breeding, selection, simulation and saving and loading.
+
+Each class is one benchmark in the style of airspeed velocity (asv): its params are the values of its param_names
+that it is run with, setup prepares it (raising NotImplementedError to skip a combination) and each time_ method is
+one measurement. ITEMS gives how many Genomes, calls or offspring each time_ method handles, for throughput.
+Run them with `python -m benchmarks` (see benchmarks/__main__.py) or with asv.
+Every benchmark seeds the random number generator in setup, so repeated runs do identical work.
+"""
+
+import os
+import shutil
+import tempfile
+from typing import Any
+
+import numpy as np
+
+from genetic_algorithm import Population, BasePlayer, Genome, SerialExecutor
+from genetic_algorithm.evolution.selection import selection_by_name
+
+
+STRUCTURES = {
+    'small': ((24,), (16, 'sigmoid'), (3, 'softmax')),
+    'medium': ((64,), (32, 'relu'), (32, 'relu'), (8, 'softmax')),
+    'large': ((256,), (256, 'sigmoid'), (64, 'softmax')),
+}
+SIZES = [100, 1000, 10_000, 100_000]
+
+#combinations whose parameters would take more memory than this are skipped
+MAX_PARAMETER_BYTES = 2**30
+
+#combinations that would save more files than this are skipped
+MAX_FILES = 10_000
+
+
+def parameter_count(structure: tuple[tuple[int,str]]) -> int:
+    return sum((previous[0] + 1) * layer[0] for previous, layer in zip(structure, structure[1:]))
+
+
+def check_memory(size: int, structure: tuple[tuple[int,str]], copies: int = 1) -> None:
+    """Skip the combination if size Genomes of the given structure (copies times over) take more than MAX_PARAMETER_BYTES."""
+
+    if size * parameter_count(structure) * 8 * copies > MAX_PARAMETER_BYTES:
+        raise NotImplementedError(f"{size} Genomes of structure {structure} need too much memory.")
+
+
+class CorridorPlayer(BasePlayer):
+    """Deterministic synthetic player that walks a corridor of fixed length, steering away from its walls.
+
+    Its position and the distance it has walked are spread across its Genome's inputs, and its outputs pick
+    between steering left, right or not at all. Its score is the distance it walks before hitting a wall.
+    """
+
+    length = 50
+
+    def __init__(self) -> None:
+        self.score = 0
+        self.fitness = 0
+        self.best_score = 0
+
+    def look(self) -> None:
+        self.vision = np.linspace(self.position, self.score / self.length, self.genome.structure[0][0])
+
+    def think(self) -> Any:
+        return int(np.argmax(self.genome.propagate(self.vision))) % 3 - 1
+
+    def move(self, move: Any) -> None:
+        self.position += 0.1 * move + 0.05 * np.sin(self.score)
+        self.score += 1
+
+    @property
+    def is_dead(self) -> bool:
+        return abs(self.position) >= 1 or self.score >= self.length
+
+    def start_state(self) -> None:
+        self.position = 0.0
+        self.score = 0
+
+
+def simulate(player: CorridorPlayer) -> CorridorPlayer:
+    player.start_state()
+    while not player.is_dead:
+        player.look()
+        player.move(player.think())
+    player.best_score = player.score
+    player.fitness = float(player.score) + 1
+    return player
+
+
+def new_population(size: int, structure: tuple[tuple[int,str]], contiguous: bool = False) -> Population:
+    """Return a seeded population of CorridorPlayers with new Genomes and distinct positive fitnesses."""
+
+    np.random.seed(0)
+    population = Population(size, [CorridorPlayer() for _ in range(size)])
+    population.new_genomes(structure, contiguous)
+    for player, fitness in zip(population.players, np.random.permutation(size) + 1.0):
+        player.fitness = fitness
+    return population
+
+
+class Propagate:
+    """Calls of Genome.propagate for a single input."""
+
+    params = list(STRUCTURES)
+    param_names = ['structure']
+    ITEMS = 1000
+
+    def setup(self, structure: str) -> None:
+        np.random.seed(0)
+        self.genome = Genome.new(1, STRUCTURES[structure])
+        self.input = np.random.uniform(-1, 1, STRUCTURES[structure][0][0])
+
+    def time_propagate(self, structure: str) -> None:
+        for _ in range(self.ITEMS):
+            self.genome.propagate(self.input)
+
+
+class PropagateBatch:
+    """Genomes fed forward together with Population.propagate_batch."""
+
+    params = (SIZES, list(STRUCTURES))
+    param_names = ['size', 'structure']
+
+    def setup(self, size: int, structure: str) -> None:
+        check_memory(size, STRUCTURES[structure])
+        self.ITEMS = size
+        self.population = new_population(size, STRUCTURES[structure], contiguous=True)
+        self.inputs = np.random.uniform(-1, 1, (size, STRUCTURES[structure][0][0]))
+
+    def time_propagate_batch(self, size: int, structure: str) -> None:
+        self.population.propagate_batch(self.inputs)
+
+
+class Selection:
+    """Parents picked in pairs from a generation's fitnesses."""
+
+    params = (SIZES, ['fitness-weighted', 'stochastic-universal', 'rank', 'tournament'])
+    param_names = ['size', 'selection_type']
+
+    def setup(self, size: int, selection_type: str) -> None:
+        np.random.seed(0)
+        self.ITEMS = size
+        self.select = selection_by_name(selection_type)
+        self.fitnesses = np.random.permutation(size) + 1.0
+
+    def time_pairs(self, size: int, selection_type: str) -> None:
+        self.select(self.fitnesses).pairs(size // 2)
+
+
+class Repopulate:
+    """Offspring bred by culling to 20% and repopulating, one at a time or batched."""
+
+    params = (SIZES, list(STRUCTURES), [False, True])
+    param_names = ['size', 'structure', 'batched']
+
+    def setup(self, size: int, structure: str, batched: bool) -> None:
+        check_memory(size, STRUCTURES[structure], 2)
+        self.ITEMS = size - max(int(size * 0.2), 2)
+        self.population = new_population(size, STRUCTURES[structure], contiguous=batched)
+        self.fitnesses = [player.fitness for player in self.population.players]
+
+    def time_repopulate(self, size: int, structure: str, batched: bool) -> None:
+        for player, fitness in zip(self.population.players, self.fitnesses):
+            player.fitness = fitness
+        self.population.cull(0.2)
+        self.population.repopulate('uniform', 'gaussian', 0.05, batched)
+
+
+class Simulate:
+    """Genomes simulated in the CorridorPlayer's environment in this process."""
+
+    params = (SIZES, list(STRUCTURES))
+    param_names = ['size', 'structure']
+
+    def setup(self, size: int, structure: str) -> None:
+        check_memory(size, STRUCTURES[structure])
+        self.ITEMS = size
+        self.population = new_population(size, STRUCTURES[structure])
+        self.executor = SerialExecutor(CorridorPlayer, simulate)
+
+    def time_simulate(self, size: int, structure: str) -> None:
+        self.population.evaluated = 0
+        self.executor.evaluate(self.population)
+
+
+class SaveLoad:
+    """Genomes saved with Population.save_parents, as a file each or as one checkpoint, and loaded back."""
+
+    params = (SIZES, list(STRUCTURES), ['folders', 'checkpoint'])
+    param_names = ['size', 'structure', 'format']
+
+    def setup(self, size: int, structure: str, format: str) -> None:
+        check_memory(size, STRUCTURES[structure], 2)
+        if format == 'folders' and size > MAX_FILES:
+            raise NotImplementedError(f"Saving {size} Genomes as files takes too long.")
+        self.ITEMS = size
+        self.population = new_population(size, STRUCTURES[structure])
+        self.folder_name = tempfile.mkdtemp()
+        self.time_save(size, structure, format)
+
+    def teardown(self, size: int, structure: str, format: str) -> None:
+        shutil.rmtree(self.folder_name)
+
+    def time_save(self, size: int, structure: str, format: str) -> None:
+        self.population.save_parents(self.folder_name, format == 'checkpoint')
+
+    def time_load(self, size: int, structure: str, format: str) -> None:
+        match(format):
+            case 'folders':
+                self.population.load(self.folder_name)
+            case 'checkpoint':
+                self.population.load(os.path.join(self.folder_name, 'checkpoint.npz'))
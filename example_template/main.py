@@ -1,8 +1,9 @@
-from multiprocessing import Pool
+from contextlib import nullcontext
+from functools import partial
 
-from genetic_algorithm import Population
+from genetic_algorithm import Population, PlayerRecord, Evaluator, IslandModel, SerialExecutor, ThreadExecutor, RemoteExecutor, serve
 from .player import Player
-from .simulator import simulate
+from .simulator import simulate, simulate_lockstep
 from .settings import player_args
 
 
@@ -12,51 +13,145 @@ population_size = genetic_algorithm_settings['population_size']
 creation_type = genetic_algorithm_settings['creation_type']
 load_folder = genetic_algorithm_settings['load_folder']
 parents_folder = genetic_algorithm_settings['parents_folder']
+parents_checkpoint = genetic_algorithm_settings['parents_checkpoint']
+background_saving = genetic_algorithm_settings['background_saving']
 total_generations = genetic_algorithm_settings['total_generations']
+lockstep_simulation = genetic_algorithm_settings['lockstep_simulation']
+executor = genetic_algorithm_settings['executor']
+remote_workers = genetic_algorithm_settings['remote_workers']
+remote_timeout = genetic_algorithm_settings['remote_timeout']
+worker_port = genetic_algorithm_settings['worker_port']
+islands = genetic_algorithm_settings['islands']
+migration_topology = genetic_algorithm_settings['migration_topology']
+migration_interval = genetic_algorithm_settings['migration_interval']
+migrants = genetic_algorithm_settings['migrants']
+cache_fitness = genetic_algorithm_settings['cache_fitness']
+cache_evaluations = genetic_algorithm_settings['cache_evaluations']
 history_folder = genetic_algorithm_settings['history_folder']
 history_type = genetic_algorithm_settings['history_type']
 history_value = genetic_algorithm_settings['history_value']
+history_backend = genetic_algorithm_settings['history_backend']
+metrics_file = genetic_algorithm_settings['metrics_file']
+metrics_format = genetic_algorithm_settings['metrics_format']
+trace_allocations = genetic_algorithm_settings['trace_allocations']
+profile_generation = genetic_algorithm_settings['profile_generation']
 structure = genetic_algorithm_settings['structure']
+contiguous_parameters = genetic_algorithm_settings['contiguous_parameters']
+shared_parameters = genetic_algorithm_settings['shared_parameters']
+parameter_dtype = genetic_algorithm_settings['parameter_dtype']
+saved_dtype = genetic_algorithm_settings['saved_dtype']
+generation_type = genetic_algorithm_settings['generation_type']
 parent_percentage = genetic_algorithm_settings['parent_percentage']
+elite_count = genetic_algorithm_settings['elite_count']
+replacement_percentage = genetic_algorithm_settings['replacement_percentage']
+selection_type = genetic_algorithm_settings['selection_type']
 crossover_type = genetic_algorithm_settings['crossover_type']
 mutation_type = genetic_algorithm_settings['mutation_type']
 mutation_rate = genetic_algorithm_settings['mutation_rate']
+mutation_step = genetic_algorithm_settings['mutation_step']
+batched_repopulation = genetic_algorithm_settings['batched_repopulation']
+
+
+#how many players survive each cull, and how many of them are kept as elites that aren't simulated again
+match(generation_type):
+    case 'generational':
+        survival_percentage, elites = parent_percentage, None
+    case 'elitist':
+        survival_percentage, elites = parent_percentage, elite_count
+    case 'steady-state':
+        survival_percentage, elites = 1 - replacement_percentage, population_size
+    case _:
+        raise TypeError(f'Invalid generation type {generation_type}')
 
 
 def main() -> None:
 
-    #initialize the population of players    
-    players = [Player(**player_args) for _ in range(population_size)]
-    population = Population(population_size, players)
+    if islands > 1:
+        evolve_islands()
+        return
+
+    #initialize the population of players, which only need to hold genomes and results unless simulated here in lockstep
+    player_factory = partial(Player, **player_args) if lockstep_simulation else PlayerRecord
+    players = [player_factory() for _ in range(population_size)]
+    population = Population(population_size, players, dtype=parameter_dtype, player_factory=player_factory)
+    population.recycle_players()
+    if saved_dtype: population.save_parameters_as(saved_dtype)
+    if background_saving: population.save_in_background()
+    if cache_fitness: population.use_fitness_cache(evaluations=cache_evaluations)
+    if metrics_file: population.instrument(metrics_file, metrics_format, trace_allocations, profile_generation)
 
     #add their Genomes
     match(creation_type):
         case 'new':
-            population.new_genomes(structure)
+            population.new_genomes(structure, contiguous_parameters, shared=shared_parameters)
         case 'load':
             population.load(load_folder)
-            population.repopulate(crossover_type, mutation_type, mutation_rate)
+            if contiguous_parameters: population.pack(shared=shared_parameters)
+            population.repopulate(crossover_type, mutation_type, mutation_rate, batched_repopulation, selection_type, mutation_step, elites)
+
+    #evolve, with persistent workers each holding their own player if not simulating in lockstep
+    with nullcontext() if lockstep_simulation else new_executor() as evaluator:
+        while population.current_generation <= total_generations:
+
+            #run the players all together or with the executor
+            if lockstep_simulation:
+                simulate_lockstep(population)
+            else:
+                evaluator.evaluate(population)
+
+            #print some stats
+            print(f'\ngeneration: {population.current_generation}, champ\'s best score: {population.champ.best_score}, ' + 
+                  f'best fitness: {round(population.champ.fitness)}, average fitness: {round(population.average_fitness)}, ', end = '')
+
+            #add to history
+            population.save_history(history_folder, history_type, history_value, history_backend)
+
+            #remove the poorly perfoming players and report the improvements
+            population.cull(survival_percentage)
+            print(f'average parent fitness: {round(population.average_fitness)}\n')
+
+            #save the parents
+            population.save_parents(parents_folder, parents_checkpoint)
+
+            #repopulate in preparation to repeat
+            population.repopulate(crossover_type, mutation_type, mutation_rate, batched_repopulation, selection_type, mutation_step, elites)
+
+    #finish any background saves, log the last generation's metrics and release any shared memory
+    population.close()
+
+
+def new_executor() -> Evaluator | SerialExecutor | ThreadExecutor | RemoteExecutor:
+
+    match(executor):
+        case 'process':
+            return Evaluator(partial(Player, **player_args), simulate)
+        case 'thread':
+            return ThreadExecutor(partial(Player, **player_args), simulate)
+        case 'serial':
+            return SerialExecutor(partial(Player, **player_args), simulate)
+        case 'remote':
+            return RemoteExecutor(remote_workers, timeout=remote_timeout)
+        case _:
+            raise TypeError(f'Invalid executor {executor}')
 
-    #evolve
-    while population.current_generation <= total_generations:
 
-        #run the players with multiprocessing
-        with Pool() as pool:
-            population.players = pool.map(simulate, population.players, chunksize=1)
+def worker(port: int = worker_port) -> None:
 
-        #print some stats
-        print(f'\ngeneration: {population.current_generation}, champ\'s best score: {population.champ.best_score}, ' + 
-              f'best fitness: {round(population.champ.fitness)}, average fitness: {round(population.average_fitness)}, ', end = '')
+    #simulate the genomes sent by a main using the 'remote' executor, run once per core on each machine with a different port each
+    serve(partial(Player, **player_args), simulate, port=port)
 
-        #add to history
-        population.save_history(history_folder, history_type, history_value)
 
-        #remove the poorly perfoming players and report the improvements
-        population.cull(parent_percentage)
-        print(f'average parent fitness: {round(population.average_fitness)}\n')
+def evolve_islands() -> None:
 
-        #save the parents
-        population.save_parents(parents_folder)
+    #evolve each island in its own process, swapping their best genomes every migration_interval generations
+    model = IslandModel(partial(Player, **player_args), simulate, structure, islands, population_size // islands, migration_topology,
+                        migration_interval, migrants, survival_percentage, contiguous_parameters, parameter_dtype, crossover_type=crossover_type,
+                        mutation_type=mutation_type, mutation_rate=mutation_rate, batched=batched_repopulation,
+                        selection_type=selection_type, mutation_step=mutation_step, elites=elites)
+    genomes = model.run(total_generations)
 
-        #repopulate in preparation to repeat
-        population.repopulate(crossover_type, mutation_type, mutation_rate)
\ No newline at end of file
+    #save the best of all the islands as parents to load from
+    champ, champ_fitness = genomes[0]
+    print(f'\nbest fitness: {round(champ_fitness)}, average fitness: {round(sum(fitness for _, fitness in genomes) / len(genomes))}')
+    for rank, (genome, fitness) in enumerate(genomes[:max(int(population_size * survival_percentage), 2)]):
+        genome.save(f'{rank}', parents_folder, fitness, saved_dtype or None)
\ No newline at end of file
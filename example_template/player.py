@@ -24,8 +24,17 @@ class Player(BasePlayer):
     def think(self) -> Any:
         """Feed the input into the Genome and turn the output into a valid move."""
 
-        genome_input = np.array([])     #some function of the vision found in self.look()
-        genome_output = self.genome.propagate(genome_input)
+        genome_output = self.genome.propagate(self.genome_input())
+        return self.decide(genome_output)
+
+    def genome_input(self) -> np.ndarray:
+        """Return the input to feed into the Genome."""
+
+        return np.array([])     #some function of the vision found in self.look()
+
+    def decide(self, genome_output: np.ndarray) -> Any:
+        """Turn the output of the Genome into a valid move."""
+        pass
 
     def move(self, move: Any) -> None:
         """Advance to the state achieved by carrying out move."""
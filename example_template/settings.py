@@ -7,23 +7,53 @@ genetic_algorithm_settings = {
     #population properties
     'population_size': 1000,        #number of players in the population
     'creation_type': 'new',         #options are ['new', 'load']
-    'load_folder': '',              #folder to load from if applicable
+    'load_folder': '',              #folder (or checkpoint file) to load from if applicable
     'parents_folder': '',           #folder to save parents of each generation to (for use with repopulation, will be overwritten each time)
+    'parents_checkpoint': False,    #save the parents as the single file {parents_folder}/checkpoint.npz rather than a file per genome
+    'background_saving': False,     #write history and parents in a background thread while the next generation is simulated
     'total_generations': 500,       #number of generations to run for
+    'lockstep_simulation': False,   #simulate all players together with batched propagation rather than one per process (requires contiguous_parameters)
+    'executor': 'process',          #options are ['process', 'thread', 'serial', 'remote']
+    'remote_workers': [],           #(host, port) of each remote worker if executor is 'remote' (start them with worker in main.py)
+    'remote_timeout': 300,          #seconds a remote worker has to reply to a chunk before it's treated as failed and its chunk re-sent
+    'worker_port': 5000,            #port a remote worker started on this machine listens on
+    'islands': 1,                   #number of separate populations (of population_size / islands players) to evolve in their own processes
+    'migration_topology': 'ring',   #options are ['ring', 'fully-connected']
+    'migration_interval': 5,        #number of generations between islands swapping their best genomes
+    'migrants': 2,                  #number of genomes each island sends to each of its neighbours
+    'cache_fitness': False,         #reuse the results of genomes that have already been simulated (e.g. surviving parents) rather than simulating them again
+    'cache_evaluations': 1,         #number of simulations to average a genome's results over before reusing them (more than 1 for stochastic simulations)
 
     #history properties
     'history_folder': '',           #folder to permanently save the best of each generation too
     'history_type': '',             #options are ['none', 'champ', 'absolute', 'percentage', 'entire']
     'history_value': 0,            #dependent on history_type: 'absolute' -> int: number to save, 'percentage' -> float: percentage to save 
+    'history_backend': 'folders',   #options are ['folders', 'store']
+
+    #instrumentation properties
+    'metrics_file': '',             #file to log the time taken by each phase of every generation to (no logging if empty)
+    'metrics_format': 'jsonl',      #options are ['jsonl', 'csv']
+    'trace_allocations': False,     #also log memory allocations with tracemalloc (slow)
+    'profile_generation': None,     #generation to run under cProfile, dumping the stats to {metrics_file}.{generation}.prof
 
     #genome properties
-    'structure': ((24, ), (16, 'sigmoid'), (3, 'softmax')),    #options for activation are ['sigmoid', 'relu', 'softmax', 'linear']
+    'structure': ((24, ), (16, 'sigmoid'), (3, 'softmax')),    #options for activation are ['sigmoid', 'relu', 'softmax', 'linear', 'tanh', 'lrelu', 'hsigmoid']
+    'contiguous_parameters': False, #hold every genome's parameters in one contiguous array owned by the population (plus a spare of the same size to breed into)
+    'shared_parameters': False,     #place that array in shared memory so workers read genomes without them being pickled (requires contiguous_parameters)
+    'parameter_dtype': 'float32',   #options are ['float64', 'float32', 'float16'], the dtype genomes are evolved and simulated in
+    'saved_dtype': '',              #dtype to save genomes in if not parameter_dtype, e.g. 'float16' to halve the disk used
 
     #evolution properties
+    'generation_type': 'generational',  #options are ['generational', 'elitist', 'steady-state']
     'parent_percentage': 0.2,       #percentage of parents to repopulate the next generation from
-    'crossover_type': 'one-point',  #options are ['one-point', 'uniform']
-    'mutation_type': 'gaussian',    #options are ['gaussian', 'uniform']
+    'elite_count': 1,               #number of the best parents carried over unchanged, and not simulated again, if generation_type is 'elitist'
+    'replacement_percentage': 0.1,  #percentage of worst players replaced each generation if generation_type is 'steady-state'
+    'selection_type': 'fitness-weighted',   #options are ['fitness-weighted', 'stochastic-universal', 'rank', 'tournament']
+    'crossover_type': 'one-point',  #options are ['one-point', 'two-point', 'biased-uniform', 'uniform', 'layer', 'blend']
+    'mutation_type': 'gaussian',    #options are ['gaussian', 'uniform', 'self-adaptive']
     'mutation_rate': 0.05,          #probability a gene will mutate
+    'mutation_step': 0.2,           #standard deviation of gaussian mutations (starting value for 'self-adaptive')
+    'batched_repopulation': False,  #breed all offspring at once straight into the contiguous parameters (requires contiguous_parameters)
 
 }
 
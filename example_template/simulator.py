@@ -1,3 +1,4 @@
+from genetic_algorithm import Population
 from .player import Player
 from .settings import simulation_settings
 
@@ -31,4 +32,25 @@ def simulate(player: Player) -> Player:
 
     player.best_score = player.score
     player.fitness = calculate_fitness()
-    return player
\ No newline at end of file
+    return player
+
+
+def simulate_lockstep(population: Population) -> None:
+    """Assign every player in the population its fitness.
+    
+    Run all the players that need simulating (see Population.players_to_simulate) in their environments at once, with the Genomes of all
+    living players propagated in one batch each tick.
+    Then collect stats and calculate the fitness of each player and assign it.
+    """
+
+    simulation_settings #to be used here
+
+    indices = population.players_to_simulate()
+    population.simulate_lockstep(indices)
+
+    for i in indices:
+        player = population.players[i]
+        player.best_score = player.score
+        player.fitness = calculate_fitness()
+
+    population.record_results(indices)
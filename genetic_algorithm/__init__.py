@@ -1,3 +1,14 @@
 from .population import Population
-from .base_player import BasePlayer
-from .genome import Genome
\ No newline at end of file
+from .base_player import BasePlayer, PlayerRecord
+from .genome import Genome
+from .parameter_store import ParameterStore
+from .activation_functions import register_activation
+from .evaluator import Evaluator
+from .history_store import HistoryStore
+from .fitness_cache import FitnessCache
+from .async_evolution import AsyncEvolution
+from .islands import IslandModel
+from .executors import Executor, SerialExecutor, ThreadExecutor
+from .remote_executor import RemoteExecutor, serve
+from .instrumentation import Instrumentation
+from .population_stats import PopulationStats
\ No newline at end of file
@@ -1,33 +1,86 @@
-from typing import Callable, Literal
+from typing import Callable
 
 import numpy as np
 
 
-def sigmoid(X: np.ndarray) -> np.ndarray:
-    return 1.0 / (1.0 + np.exp(-X))
+#all activations operate elementwise or along the last axis, so can be applied to a batch of neurons
+#if out is given the result is written into it (out may be X itself) rather than a new array
 
-def relu(X: np.ndarray) -> np.ndarray:
-    return np.maximum(0, X)
 
-def softmax(X: np.ndarray) -> np.ndarray:
-    return np.array([1/sum(np.exp(np.subtract(X, _))) for _ in np.nditer(X)])
+def sigmoid(X: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    out = np.multiply(X, 0.5, out=out)     #1/(1+e^-x) = (1+tanh(x/2))/2 doesn't overflow
+    np.tanh(out, out=out)
+    out += 1
+    out *= 0.5
+    return out
 
-def linear(X: np.ndarray) -> np.ndarray:
-    return X
+def relu(X: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    return np.maximum(X, 0, out=out)
 
-def activation_by_name(name: Literal['sigmoid', 'relu', 'softmax', 'linear']) -> Callable[[np.ndarray], np.ndarray]:
-    """Return activation function from name."""
+def softmax(X: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    out = np.subtract(X, np.max(X, axis=-1, keepdims=True), out=out)
+    np.exp(out, out=out)
+    out /= np.sum(out, axis=-1, keepdims=True)
+    return out
+
+def linear(X: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    if out is None:
+        return X
+    np.copyto(out, X)
+    return out
+
+def tanh(X: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    return np.tanh(X, out=out)
+
+def lrelu(X: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    if out is X:
+        return np.multiply(X, 0.01, out=out, where=X < 0)    #in place there's nowhere to keep 0.01x, so only the negatives are scaled
+    out = np.multiply(X, 0.01, out=out)
+    return np.maximum(X, out, out=out)
+
+def hsigmoid(X: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    out = np.multiply(X, 0.2, out=out)
+    out += 0.5
+    return np.clip(out, 0, 1, out=out)
+
+
+_activations = {
+    'sigmoid': sigmoid,
+    'relu': relu,
+    'softmax': softmax,
+    'linear': linear,
+    'tanh': tanh,
+    'lrelu': lrelu,
+    'hsigmoid': hsigmoid,
+}
+
+def register_activation(name: str, activation: Callable[..., np.ndarray]) -> None:
+    """Make an activation function available by name.
 
-    activations = {
-        'sigmoid': sigmoid,
-        'relu': relu,
-        'softmax': softmax,
-        'linear': linear,
-    }
+    The function must accept an array and an optional out array, and operate elementwise or along the last axis.
+    The name must be at most 8 bytes long so that it fits into the structure saved with a Genome.
+    """
+
+    if len(name.encode('utf-8')) > 8:
+        raise TypeError(f"Activation function name {name} is longer than 8 bytes.")
+
+    _activations[name] = activation
+
+def activation_by_name(name: str) -> Callable[..., np.ndarray]:
+    """Return activation function from name."""
 
     try:
-        activation = activations[name]
+        activation = _activations[name]
     except KeyError:
         raise TypeError(f"Invalid activation function {name}.")
 
-    return activation
\ No newline at end of file
+    return activation
+
+def activation_name(activation: Callable[..., np.ndarray]) -> str:
+    """Return the name an activation function is registered under."""
+
+    for name, registered in _activations.items():
+        if registered is activation:
+            return name
+
+    raise TypeError(f"Unregistered activation function {activation.__name__}.")
@@ -0,0 +1,97 @@
+from queue import SimpleQueue
+import time
+
+import numpy as np
+
+from genetic_algorithm.base_player import BasePlayer
+from genetic_algorithm.evaluator import Evaluator
+from genetic_algorithm.population import Population
+from genetic_algorithm.evolution.selection import selection_by_name
+from genetic_algorithm.evolution.crossover import crossover_by_name
+from genetic_algorithm.evolution.mutation import mutation_by_name
+
+
+class AsyncEvolution:
+    """Generation-free evolution of a Population, keeping an Evaluator's workers busy all the time.
+
+    Rather than waiting for a whole generation to be simulated, as soon as any simulation finishes its player is inserted
+    into the population (replacing the least fit player, if it is fitter) and a new offspring, bred from the population
+    as it then stands, is sent to be simulated in its place. One slow simulation therefore never holds up the rest.
+    The population's current_generation goes up every population size simulations so that birth generations stay comparable.
+    """
+
+    def __init__(self, population: Population, evaluator: Evaluator, crossover_type: str, mutation_type: str, mutation_rate: float,
+                 selection_type: str = 'fitness-weighted', mutation_step: float = 0.2, in_flight: int | None = None) -> None:
+        self.population = population
+        self.evaluator = evaluator
+        self.select = selection_by_name(selection_type)
+        self.crossover = crossover_by_name(crossover_type)
+        self.mutate = mutation_by_name(mutation_type)
+        self.mutation_rate = mutation_rate
+        self.mutation_step = mutation_step
+        self.in_flight = in_flight or 2 * evaluator.processes     #enough that a worker never waits on the main process
+        self.evaluations_per_second = None
+        self._offspring = []
+
+    def run(self, evaluations: int) -> None:
+        """Simulate evaluations offspring, inserting each into the population as soon as its simulation finishes.
+
+        Any players in the population that need simulating are simulated first, and the population is ranked at the end.
+        """
+
+        population = self.population
+        if population.players_to_simulate():
+            self.evaluator.evaluate(population)
+        fitness = population.fitness.copy()
+
+        results = SimpleQueue()
+        def dispatch() -> None:
+            player = self._breed(fitness)
+            self.evaluator.submit(player.genome, lambda result: results.put((player, result)), lambda error: results.put((player, error)))
+
+        start = time.perf_counter()
+        dispatched = min(self.in_flight, evaluations)
+        for _ in range(dispatched):
+            dispatch()
+
+        for completed in range(1, evaluations + 1):
+
+            player, result = results.get()
+            if isinstance(result, BaseException):
+                raise result
+            player.fitness, player.score, player.best_score = result
+
+            #replace the least fit player
+            worst = np.argmin(fitness)
+            if player.fitness > fitness[worst]:
+                population.recycle([population.players[worst]])
+                population.players[worst] = player
+                fitness[worst] = player.fitness
+            else:
+                population.recycle([player])
+
+            if completed % population.size == 0:
+                population.current_generation += 1
+
+            if dispatched < evaluations:
+                dispatch()
+                dispatched += 1
+
+        self.evaluations_per_second = evaluations / (time.perf_counter() - start)
+        population.record_results([])
+        population.rank()
+
+    def _breed(self, fitness: np.ndarray) -> BasePlayer:
+        """Return a new offspring of the population as it stands, with its Genome crossed over and mutated."""
+
+        if not self._offspring:
+            players = self.population.players
+            i, j = self.select(fitness).pairs(1)[0]
+            parent1, parent2 = players[i], players[j]
+            offspring1, offspring2 = self.population.blank_player(parent1), self.population.blank_player(parent2)
+            offspring1.genome, offspring2.genome = self.crossover(parent1.genome, parent2.genome, self.population.current_generation)
+            self._offspring.extend([offspring1, offspring2])
+
+        offspring = self._offspring.pop()
+        self.mutate(offspring.genome, self.mutation_rate, self.mutation_step)
+        return offspring
@@ -0,0 +1,64 @@
+from __future__ import annotations
+from queue import Queue
+from threading import Thread
+from typing import Callable
+
+
+class BackgroundWriter:
+    """Thread that carries out writes one at a time, in the order they were submitted.
+
+    At most max_pending writes can be waiting at once, after which submitting blocks until one finishes, so a slow disk
+    holds back the caller rather than letting snapshots pile up in memory.
+    If a write fails the error is raised on the next submit, flush or close.
+    """
+
+    def __init__(self, max_pending: int = 2) -> None:
+        self.queue = Queue(max_pending)
+        self.error = None
+        self.thread = Thread(target=self._run, name='BackgroundWriter', daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while (write := self.queue.get()) is not None:
+            write_function, args = write
+            try:
+                if self.error is None:
+                    write_function(*args)
+            except BaseException as error:
+                self.error = error
+            finally:
+                self.queue.task_done()
+        self.queue.task_done()
+
+    def submit(self, write_function: Callable[..., None], *args) -> None:
+        """Queue write_function(*args) to be called in the background, waiting for room in the queue if it is full.
+
+        The arguments must not be changed afterwards, so should be snapshots of anything the caller goes on to modify.
+        """
+
+        self._raise_error()
+        self.queue.put((write_function, args))
+
+    def flush(self) -> None:
+        """Wait for every submitted write to finish."""
+
+        self.queue.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """Finish every submitted write and stop the thread."""
+
+        self.queue.put(None)
+        self.thread.join()
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def __enter__(self) -> BackgroundWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
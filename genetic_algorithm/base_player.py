@@ -3,11 +3,15 @@ from abc import ABC, abstractmethod
 from typing import Any
 from copy import deepcopy
 
+import numpy as np
+
 from genetic_algorithm.genome import Genome
 
 class BasePlayer(ABC):
     """Abstract base class for a Player in a population."""
 
+    __slots__ = ()      #so that subclasses can be slotted too (see PlayerRecord)
+
     def __init__(self) -> None:
         pass
 
@@ -53,6 +57,20 @@ class BasePlayer(ABC):
         """Feed the input into the Genome and turn the output into a valid move."""
         pass
 
+    def genome_input(self) -> np.ndarray:
+        """Return the input to feed into the Genome.
+        
+        Only required for lock-step simulation via Population.simulate_lockstep.
+        """
+        raise NotImplementedError
+
+    def decide(self, genome_output: np.ndarray) -> Any:
+        """Turn the output of the Genome into a valid move.
+        
+        Only required for lock-step simulation via Population.simulate_lockstep.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def move(self, move: Any) -> None:
         """Advance to the state achieved by carrying out move."""
@@ -72,12 +90,55 @@ class BasePlayer(ABC):
     def __eq__(self, other: BasePlayer) -> bool:
         return self.genome == other.genome
 
+    def reset(self) -> None:
+        """Remove the player's genome and results so that it can be reused for a new one."""
+
+        self.genome = None
+        self.fitness = 0
+        self.score = 0
+        self.best_score = 0
+
     def empty_clone(self) -> BasePlayer:
-        """Return a new instance of self's class without a genome."""
-        
-        clone = deepcopy(self)
-        clone.fitness = 0
-        clone.best_score = 0
-        clone.genome = None
+        """Return a new instance of self's class without a genome.
+
+        The player is deep copied (apart from its genome, which is never copied) and the copy is then reset.
+        Override to construct the clone directly, or give the Population a player_factory, if copying the rest of the player is expensive.
+        """
+
+        genome = getattr(self, 'genome', None)
+        clone = deepcopy(self, {id(genome): None})
+        clone.reset()
+
+        return clone
+
+
+class PlayerRecord(BasePlayer):
+    """Compact player that only holds a genome and its results, for populations whose players are never simulated themselves.
+
+    That is the case whenever they are simulated by an Executor, whose workers simulate their own players, and saves
+    memory and time for large populations. Only the cheap reset and empty_clone are implemented.
+    """
+
+    __slots__ = ('_genome', '_fitness', '_score', '_best_score')
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def look(self) -> None:
+        raise Exception("PlayerRecords can't be simulated, simulate their Genomes with an Executor.")
+
+    def think(self) -> Any:
+        raise Exception("PlayerRecords can't be simulated, simulate their Genomes with an Executor.")
+
+    def move(self, move: Any) -> None:
+        raise Exception("PlayerRecords can't be simulated, simulate their Genomes with an Executor.")
+
+    @property
+    def is_dead(self) -> bool:
+        raise Exception("PlayerRecords can't be simulated, simulate their Genomes with an Executor.")
+
+    def start_state(self) -> None:
+        raise Exception("PlayerRecords can't be simulated, simulate their Genomes with an Executor.")
 
-        return clone
\ No newline at end of file
+    def empty_clone(self) -> PlayerRecord:
+        return PlayerRecord()
\ No newline at end of file
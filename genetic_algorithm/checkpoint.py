@@ -0,0 +1,111 @@
+import os
+import zipfile
+
+import numpy as np
+
+
+#a checkpoint is an uncompressed .npz holding the parameters of every Genome as one (Genomes, parameter count) array
+#alongside their bookkeeping, so the parameters can be memory-mapped straight out of the file rather than read.
+
+
+def save_checkpoint(file_name: str, parameters: np.ndarray, structure: tuple[tuple[int,str]], fitness: np.ndarray,
+                    best_score: np.ndarray, birth_gen: np.ndarray, mutation_step: np.ndarray, current_generation: int,
+                    random_state: tuple | None = None) -> int:
+    """Save a population's Genomes and the state needed to resume evolving it into one file.
+
+    Row i of parameters and element i of the other arrays belong to the same Genome, and a mutation_step of NaN means
+    the Genome has none. The random_state (as returned by np.random.get_state) is saved too, defaulting to the current one.
+    The file is written to a temporary file first and then renamed, so an existing checkpoint is only ever replaced by a complete one.
+    Returns the size of the file in bytes.
+    """
+
+    folder_name = os.path.dirname(file_name)
+    if folder_name and not os.path.exists(folder_name):
+        os.makedirs(folder_name)
+
+    _, keys, position, has_gauss, cached_gaussian = np.random.get_state() if random_state is None else random_state
+    checkpoint_dict = dict()
+    checkpoint_dict['parameters'] = parameters
+    checkpoint_dict['input_size'] = structure[0][0]
+    checkpoint_dict['save_structure'] = np.array(list(structure[1:]), dtype='int,S8')
+    checkpoint_dict['fitness'] = fitness
+    checkpoint_dict['best_score'] = best_score
+    checkpoint_dict['birth_gen'] = birth_gen
+    checkpoint_dict['mutation_step'] = mutation_step
+    checkpoint_dict['current_generation'] = current_generation
+    checkpoint_dict['random_keys'] = keys
+    checkpoint_dict['random_position'] = position
+    checkpoint_dict['random_gauss'] = np.array([has_gauss, cached_gaussian])
+
+    temporary_name = f'{file_name}.tmp'
+    with open(temporary_name, 'wb') as file:
+        np.savez(file, **checkpoint_dict)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_name, file_name)
+
+    return os.path.getsize(file_name)
+
+
+def load_checkpoint(file_name: str, mmap_mode: str | None = 'c') -> dict:
+    """Load a checkpoint saved with save_checkpoint.
+
+    Returns a dictionary of everything saved, with the structure rebuilt under 'structure'.
+    Unless mmap_mode is None the parameters are memory-mapped in that mode (as in np.load) rather than read, so pages are
+    only read from disk once they are used. The default 'c' is copy-on-write, so the parameters can be modified without
+    the file changing.
+    """
+
+    with np.load(file_name) as checkpoint_file:
+        checkpoint = {key: checkpoint_file[key] for key in checkpoint_file.files if key != 'parameters' or mmap_mode is None}
+
+    if mmap_mode is not None:
+        checkpoint['parameters'] = _memmap_member(file_name, 'parameters.npy', mmap_mode)
+
+    checkpoint['structure'] = ((int(checkpoint['input_size']),),) + tuple((int(size), activation.decode('utf-8'))
+                                                                          for size, activation in checkpoint['save_structure'])
+    checkpoint['current_generation'] = int(checkpoint['current_generation'])
+    return checkpoint
+
+
+def restore_random_state(checkpoint: dict) -> None:
+    """Set the global random state to the one saved in a checkpoint."""
+
+    has_gauss, cached_gaussian = checkpoint['random_gauss']
+    np.random.set_state(('MT19937', checkpoint['random_keys'], int(checkpoint['random_position']), int(has_gauss), float(cached_gaussian)))
+
+
+def _memmap_member(file_name: str, member_name: str, mmap_mode: str) -> np.ndarray:
+    """Return a memory-map of an array stored uncompressed in a .npz file."""
+
+    with zipfile.ZipFile(file_name) as archive:
+        info = archive.getinfo(member_name)
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise Exception(f"Cannot memory-map the compressed array {member_name} in {file_name}.")
+
+    with open(file_name, 'rb') as file:
+
+        #skip the member's local header, whose name and extra field lengths are its last 4 bytes
+        file.seek(info.header_offset + 26)
+        name_length, extra_length = int.from_bytes(file.read(2), 'little'), int.from_bytes(file.read(2), 'little')
+        file.seek(name_length + extra_length, os.SEEK_CUR)
+
+        shape, fortran_order, dtype = read_npy_header(file)
+        offset = file.tell()
+
+    return np.memmap(file_name, dtype=dtype, mode=mmap_mode, offset=offset, shape=shape, order='F' if fortran_order else 'C').view(np.ndarray)
+
+
+def read_npy_header(file) -> tuple[tuple[int, ...], bool, np.dtype]:
+    """Read the header of the .npy array starting at the file's position and return its shape, fortran order and dtype.
+
+    The file is left positioned at the start of the array's data.
+    """
+
+    match(np.lib.format.read_magic(file)):
+        case (1, 0):
+            return np.lib.format.read_array_header_1_0(file)
+        case (2, 0):
+            return np.lib.format.read_array_header_2_0(file)
+        case version:
+            raise Exception(f"Unsupported .npy version {version}.")
@@ -0,0 +1,181 @@
+from __future__ import annotations
+from math import ceil
+from multiprocessing import Pool, Value
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.sharedctypes import Synchronized
+import os
+import time
+from typing import Callable
+
+import numpy as np
+
+from genetic_algorithm.base_player import BasePlayer
+from genetic_algorithm.genome import Genome
+from genetic_algorithm.population import Population
+from genetic_algorithm.executors import Executor
+
+
+#the player and simulate function held by each worker process
+_player: BasePlayer | None = None
+_simulate: Callable[[BasePlayer], BasePlayer] | None = None
+_busy_seconds: Synchronized | None = None   #shared between the workers
+
+#shared memory blocks this worker has attached to, by name
+_attached: dict[str, SharedMemory] = dict()
+
+#the results of a simulation as written into shared memory
+RESULT_DTYPE = np.dtype([('fitness', 'f8'), ('score', 'i8'), ('best_score', 'i8')])
+
+
+def _initialize_worker(player_factory: Callable[[], BasePlayer], simulate: Callable[[BasePlayer], BasePlayer], busy_seconds: Synchronized) -> None:
+    """Create the player this worker will reuse for every Genome it is sent."""
+
+    global _player, _simulate, _busy_seconds
+    _player = player_factory()
+    _simulate = simulate
+    _busy_seconds = busy_seconds
+
+
+def _add_busy_seconds(start: float) -> None:
+    """Add the time since start to the seconds the workers have spent simulating."""
+
+    with _busy_seconds.get_lock():
+        _busy_seconds.value += time.perf_counter() - start
+
+
+def _evaluate(genome: Genome) -> tuple[float, int, int]:
+    """Simulate the worker's player with the given Genome and return its fitness, score and best score."""
+
+    start = time.perf_counter()
+    _player.genome = genome
+    player = _simulate(_player)
+    _add_busy_seconds(start)
+    return player.fitness, player.score, player.best_score
+
+
+def _attach(name: str, shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    """Return an array over the named block of shared memory, attaching to it the first time it is seen."""
+
+    if name not in _attached:
+        _attached[name] = SharedMemory(name)
+
+    return np.ndarray(shape, dtype=dtype, buffer=_attached[name].buf)
+
+
+def _evaluate_rows(task: tuple) -> None:
+    """Simulate the worker's player with the Genomes in the given rows of a shared ParameterStore.
+
+    The Genomes are views straight into the shared memory and the results are written into the shared results array.
+    """
+
+    start = time.perf_counter()
+    parameters_name, results_name, shape, dtype, structure, rows = task
+    parameters = _attach(parameters_name, shape, dtype)
+    results = _attach(results_name, (shape[0],), RESULT_DTYPE)
+
+    for row in rows:
+        _player.genome = Genome.view(parameters[row], structure)
+        player = _simulate(_player)
+        results[row] = (player.fitness, player.score, player.best_score)
+    _player.genome = None
+    _add_busy_seconds(start)
+
+
+class Evaluator(Executor):
+    """Long-lived pool of worker processes that simulate the players of a Population.
+
+    Each worker creates its own player with player_factory once and reuses it for every Genome it is sent,
+    so only Genomes are sent to the workers and only fitness, score and best score are sent back.
+    If the population's ParameterStore is shared the workers instead read the Genomes straight out of shared memory and
+    write their results into a shared array, so only row ranges are sent regardless of the size of the Genomes.
+    Scores are stored as integers when evaluating through shared memory.
+    The player_factory and simulate function must be picklable (e.g. a module level class or functools.partial of one).
+    """
+
+    #minimum amount of simulation to send to a worker at once so that cheap simulations aren't dominated by IPC
+    target_chunk_seconds = 0.01
+
+    def __init__(self, player_factory: Callable[[], BasePlayer], simulate: Callable[[BasePlayer], BasePlayer], processes: int | None = None) -> None:
+        self.processes = self.workers = processes or os.cpu_count()
+        self.busy = Value('d', 0.0)
+        self.pool = Pool(self.processes, _initialize_worker, (player_factory, simulate, self.busy))
+        self.seconds_per_genome = None
+        self.results = None
+        self.results_memory = None
+
+    @property
+    def busy_seconds(self) -> float:
+        """Total seconds the workers have spent simulating."""
+        return self.busy.value
+
+    def chunksize(self, count: int) -> int:
+        """Return how many of count Genomes to send to a worker at once.
+
+        Chunks are kept small enough that every worker gets several (so slow simulations balance out), but once the cost
+        of a simulation has been measured they are made big enough to each hold target_chunk_seconds of work, up to an
+        even split of the Genomes between the workers.
+        """
+
+        balanced = max(1, count // (self.processes * 4))
+        if not self.seconds_per_genome:
+            return balanced
+
+        return max(1, min(ceil(count / self.processes), max(balanced, ceil(self.target_chunk_seconds / self.seconds_per_genome))))
+
+    def simulate(self, population: Population, indices: list[int]) -> list[tuple[float, int, int]]:
+        """Return the fitness, score and best score of simulating the population's players at the given indices in the workers."""
+
+        start = time.perf_counter()
+        if population.parameters is not None and population.parameters.shared:
+            results = self._evaluate_shared(population, indices)
+        else:
+            results = self.pool.map(_evaluate, [population.players[i].genome for i in indices], chunksize=self.chunksize(len(indices)))
+        self.seconds_per_genome = (time.perf_counter() - start) * self.processes / len(indices)
+
+        return results
+
+    def submit(self, genome: Genome, callback: Callable[[tuple[float, int, int]], None], error_callback: Callable[[BaseException], None]) -> None:
+        """Simulate a single Genome in a worker without waiting for it.
+
+        Once done, its fitness, score and best score are passed to callback (or the error raised to error_callback) in a thread of the pool's.
+        """
+
+        self.pool.apply_async(_evaluate, (genome,), callback=callback, error_callback=error_callback)
+
+    def _evaluate_shared(self, population: Population, indices: list[int]) -> list[tuple[float, int, int]]:
+        """Simulate the population's Genomes at the given indices in place in its shared ParameterStore and return their results."""
+
+        population.sync_parameters()    #before the store is read, as repacking moves it into its other block of shared memory
+        store = population.parameters
+        if self.results is None or len(self.results) != store.size:
+            self._release_results()
+            self.results_memory = SharedMemory(create=True, size=store.size * RESULT_DTYPE.itemsize)
+            self.results = np.ndarray((store.size,), dtype=RESULT_DTYPE, buffer=self.results_memory.buf)
+
+        #send whole ranges of rows when every player is being simulated, as they pickle to almost nothing
+        count = len(indices)
+        rows = range(count) if count == len(population.players) else indices
+        chunksize = self.chunksize(count)
+        tasks = [(store.memory.name, self.results_memory.name, store.array.shape, store.dtype, store.structure, rows[start:start + chunksize])
+                 for start in range(0, count, chunksize)]
+        self.pool.map(_evaluate_rows, tasks, chunksize=1)
+
+        return self.results[indices].tolist()
+
+    def _release_results(self) -> None:
+        """Release the shared memory holding the results, if any."""
+
+        if self.results_memory is None:
+            return
+
+        self.results = None
+        self.results_memory.close()
+        self.results_memory.unlink()
+        self.results_memory = None
+
+    def close(self) -> None:
+        """Wait for the workers to finish and shut them down."""
+
+        self.pool.close()
+        self.pool.join()
+        self._release_results()
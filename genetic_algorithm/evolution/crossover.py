@@ -5,59 +5,242 @@ import numpy as np
 from genetic_algorithm.genome import Genome
 
 
+#apart from blend, each crossover picks which parent every gene of the first offspring comes from in a single mask (True
+#meaning parent2) and the second offspring takes the genes the first didn't. Offspring get freshly allocated parameters
+#(or are written into the given rows when batched), nothing is deepcopied.
+
+
+def k_point_crossover(parent1: Genome, parent2: Genome, gen: int, k: int) -> tuple[Genome, Genome]:
+    """Return a crossover of two Genomes that swaps parent at k randomly chosen points in their parameters.
+
+    The points are drawn independently so coincident points cancel out.
+    The genomes must always have the same structure.
+    """
+
+    count = len(parent1.flat_parameters())
+    cuts = np.random.randint(1, count, size=k)
+    mask = _alternate(np.bincount(cuts, minlength=count))
+
+    return _masked_offspring(parent1, parent2, mask, gen)
+
+
 def one_point_crossover(parent1: Genome, parent2: Genome, gen: int) -> tuple[Genome, Genome]:
-    """Return a crossover of two Genomes with randomly chosen proportion from each.
-    
+    """Return a crossover of two Genomes that swaps parent at one randomly chosen point in their parameters.
+
     The genomes must always have the same structure.
     """
 
-    offspring1 = parent1.clone()
-    offspring2 = parent2.clone()
-    offspring1.birth_gen = offspring2.birth_gen = gen
+    return k_point_crossover(parent1, parent2, gen, 1)
 
-    crossover_rate = np.random.uniform(0,1)
-    for i, (l1, l2) in enumerate(zip(parent1.layers, parent2.layers)):
 
-        weights_mask = np.random.uniform(0, 1, size=l1.weights.shape)
-        offspring1.layers[i].weights[weights_mask > crossover_rate] = l2.weights[weights_mask > crossover_rate]
-        offspring2.layers[i].weights[weights_mask > crossover_rate] = l1.weights[weights_mask > crossover_rate]
+def two_point_crossover(parent1: Genome, parent2: Genome, gen: int) -> tuple[Genome, Genome]:
+    """Return a crossover of two Genomes that swaps parent at two randomly chosen points in their parameters.
 
-        bias_mask = np.random.uniform(0, 1, size=l1.bias.shape)
-        offspring1.layers[i].bias[bias_mask > crossover_rate] = l2.bias[bias_mask > crossover_rate]
-        offspring2.layers[i].bias[bias_mask > crossover_rate] = l1.bias[bias_mask > crossover_rate]
+    The genomes must always have the same structure.
+    """
+
+    return k_point_crossover(parent1, parent2, gen, 2)
+
+
+def biased_uniform_crossover(parent1: Genome, parent2: Genome, gen: int) -> tuple[Genome, Genome]:
+    """Return a crossover of two Genomes with randomly chosen proportion from each.
 
-    return offspring1, offspring2
+    The genomes must always have the same structure.
+    """
+
+    crossover_rate = np.random.uniform(0,1)
+    mask = np.random.uniform(0, 1, size=len(parent1.flat_parameters())) > crossover_rate
+
+    return _masked_offspring(parent1, parent2, mask, gen)
 
 
 def uniform_crossover(parent1: Genome, parent2: Genome, gen: int) -> tuple[Genome, Genome]:
     """Return a crossover of two Genomes with 50:50 proportion from each.
-    
+
     The genomes must always have the same structure.
     """
 
-    offspring1 = parent1.clone()
-    offspring2 = parent2.clone()
-    offspring1.birth_gen = offspring2.birth_gen = gen
+    mask = np.random.uniform(0, 1, size=len(parent1.flat_parameters())) > 0.5
+
+    return _masked_offspring(parent1, parent2, mask, gen)
+
+
+def layer_crossover(parent1: Genome, parent2: Genome, gen: int) -> tuple[Genome, Genome]:
+    """Return a crossover of two Genomes where each whole layer comes from either parent with equal probability.
+
+    The genomes must always have the same structure.
+    """
+
+    layer_counts = [layer.parameter_count for layer in parent1.layers]
+    mask = np.repeat(np.random.uniform(0, 1, size=len(layer_counts)) > 0.5, layer_counts)
+
+    return _masked_offspring(parent1, parent2, mask, gen)
+
+
+def blend_crossover(parent1: Genome, parent2: Genome, gen: int) -> tuple[Genome, Genome]:
+    """Return a crossover of two Genomes whose parameters are a random weighted average of the parents'.
+
+    The first offspring is a*parent1 + (1-a)*parent2 and the second (1-a)*parent1 + a*parent2, with a ~U[0,1].
+    The genomes must always have the same structure.
+    """
+
+    a = np.random.uniform(0,1)
+    parameters1, parameters2 = parent1.flat_parameters(), parent2.flat_parameters()
+    offspring1 = a * parameters1 + (1 - a) * parameters2
+    offspring2 = parameters1 + parameters2 - offspring1
+
+    structure = parent1.structure
+    return _inherit(Genome.view(offspring1, structure, gen), parent1), _inherit(Genome.view(offspring2, structure, gen), parent2)
+
+
+def _alternate(cut_counts: np.ndarray) -> np.ndarray:
+    """Return a mask that flips between False and True at every cut along the last axis.
+
+    Cuts coinciding at the same point cancel out.
+    """
+
+    return (np.cumsum(cut_counts, axis=-1) % 2).astype(bool)
+
+
+def _masked_offspring(parent1: Genome, parent2: Genome, mask: np.ndarray, gen: int) -> tuple[Genome, Genome]:
+    """Return offspring with genes from parent2 where mask is True and parent1 elsewhere, and vice versa."""
+
+    parameters1, parameters2 = parent1.flat_parameters(), parent2.flat_parameters()
+    structure = parent1.structure
 
-    for i, (l1, l2) in enumerate(zip(parent1.layers, parent2.layers)):
+    offspring1 = Genome.view(np.where(mask, parameters2, parameters1), structure, gen)
+    offspring2 = Genome.view(np.where(mask, parameters1, parameters2), structure, gen)
+    return _inherit(offspring1, parent1), _inherit(offspring2, parent2)
 
-        weights_mask = np.random.uniform(0, 1, size=l1.weights.shape)
-        offspring1.layers[i].weights[weights_mask > 0.5] = l2.weights[weights_mask > 0.5]
-        offspring2.layers[i].weights[weights_mask > 0.5] = l1.weights[weights_mask > 0.5]
 
-        bias_mask = np.random.uniform(0, 1, size=l1.bias.shape)
-        offspring1.layers[i].bias[bias_mask > 0.5] = l2.bias[bias_mask > 0.5]
-        offspring2.layers[i].bias[bias_mask > 0.5] = l1.bias[bias_mask > 0.5]
+def _inherit(offspring: Genome, parent: Genome) -> Genome:
+    """Pass on the parent's mutation step size to the offspring and return it."""
 
-    return offspring1, offspring2
-    
+    offspring.mutation_step = parent.mutation_step
+    return offspring
 
-def crossover_by_name(name: Literal['one-point', 'uniform']) -> Callable[[Genome, Genome, int], tuple[Genome, Genome]]:
+
+def batch_k_point_crossover(parents1: np.ndarray, parents2: np.ndarray, out1: np.ndarray, out2: np.ndarray,
+                            structure: tuple[tuple[int,str]], k: int) -> None:
+    """Write k-point crossovers of each pair of rows of parents1 and parents2 into out1 and out2.
+
+    Each pair gets its own k cut points, drawn independently so coincident cuts cancel out.
+    All arrays must have shape (pairs, parameter count).
+    """
+
+    pairs, count = parents1.shape
+    cut_counts = np.zeros((pairs, count), dtype=np.int8)
+    np.add.at(cut_counts, (np.arange(pairs)[:, np.newaxis], np.random.randint(1, count, size=(pairs, k))), 1)
+    _write_crossover(parents1, parents2, _alternate(cut_counts), out1, out2)
+
+
+def batch_one_point_crossover(parents1: np.ndarray, parents2: np.ndarray, out1: np.ndarray, out2: np.ndarray,
+                              structure: tuple[tuple[int,str]]) -> None:
+    """Write one-point crossovers of each pair of rows of parents1 and parents2 into out1 and out2."""
+
+    batch_k_point_crossover(parents1, parents2, out1, out2, structure, 1)
+
+
+def batch_two_point_crossover(parents1: np.ndarray, parents2: np.ndarray, out1: np.ndarray, out2: np.ndarray,
+                              structure: tuple[tuple[int,str]]) -> None:
+    """Write two-point crossovers of each pair of rows of parents1 and parents2 into out1 and out2."""
+
+    batch_k_point_crossover(parents1, parents2, out1, out2, structure, 2)
+
+
+def batch_biased_uniform_crossover(parents1: np.ndarray, parents2: np.ndarray, out1: np.ndarray, out2: np.ndarray,
+                                   structure: tuple[tuple[int,str]]) -> None:
+    """Write crossovers of each pair of rows of parents1 and parents2 into out1 and out2.
+
+    Each pair is crossed over as in biased_uniform_crossover, with its own randomly chosen proportion from each.
+    All arrays must have shape (pairs, parameter count).
+    """
+
+    crossover_rates = np.random.uniform(0, 1, size=(len(parents1), 1))
+    mask = np.random.uniform(0, 1, size=parents1.shape) > crossover_rates
+    _write_crossover(parents1, parents2, mask, out1, out2)
+
+
+def batch_uniform_crossover(parents1: np.ndarray, parents2: np.ndarray, out1: np.ndarray, out2: np.ndarray,
+                            structure: tuple[tuple[int,str]]) -> None:
+    """Write crossovers of each pair of rows of parents1 and parents2 into out1 and out2.
+
+    Each pair is crossed over as in uniform_crossover, with 50:50 proportion from each.
+    All arrays must have shape (pairs, parameter count).
+    """
+
+    mask = np.random.uniform(0, 1, size=parents1.shape) > 0.5
+    _write_crossover(parents1, parents2, mask, out1, out2)
+
+
+def batch_layer_crossover(parents1: np.ndarray, parents2: np.ndarray, out1: np.ndarray, out2: np.ndarray,
+                          structure: tuple[tuple[int,str]]) -> None:
+    """Write crossovers of each pair of rows of parents1 and parents2 into out1 and out2.
+
+    Each pair is crossed over as in layer_crossover, with each whole layer coming from either parent.
+    All arrays must have shape (pairs, parameter count).
+    """
+
+    layer_counts = [layer_properties[0] * (structure[i][0] + 1) for i, layer_properties in enumerate(structure[1:])]
+    mask = np.repeat(np.random.uniform(0, 1, size=(len(parents1), len(layer_counts))) > 0.5, layer_counts, axis=1)
+    _write_crossover(parents1, parents2, mask, out1, out2)
+
+
+def batch_blend_crossover(parents1: np.ndarray, parents2: np.ndarray, out1: np.ndarray, out2: np.ndarray,
+                          structure: tuple[tuple[int,str]]) -> None:
+    """Write crossovers of each pair of rows of parents1 and parents2 into out1 and out2.
+
+    Each pair is crossed over as in blend_crossover, with its own randomly chosen weighting.
+    All arrays must have shape (pairs, parameter count).
+    """
+
+    a = np.random.uniform(0, 1, size=(len(parents1), 1))
+    np.subtract(parents1, parents2, out=out1)
+    out1 *= a
+    out1 += parents2
+    np.add(parents1, parents2, out=out2)
+    out2 -= out1
+
+
+def _write_crossover(parents1: np.ndarray, parents2: np.ndarray, mask: np.ndarray, out1: np.ndarray, out2: np.ndarray) -> None:
+    """Write parents1 with genes from parents2 where mask is True into out1, and vice versa into out2."""
+
+    np.copyto(out1, parents1)
+    np.copyto(out1, parents2, where=mask)
+    np.copyto(out2, parents2)
+    np.copyto(out2, parents1, where=mask)
+
+
+def crossover_by_name(name: Literal['one-point', 'two-point', 'biased-uniform', 'uniform', 'layer', 'blend']) -> Callable[[Genome, Genome, int], tuple[Genome, Genome]]:
     """Return crossover function from name."""
 
     crossovers = {
         'one-point': one_point_crossover,
+        'two-point': two_point_crossover,
+        'biased-uniform': biased_uniform_crossover,
         'uniform': uniform_crossover,
+        'layer': layer_crossover,
+        'blend': blend_crossover,
+    }
+
+    try:
+        crossover = crossovers[name]
+    except KeyError:
+        raise TypeError(f"Invalid crossover function {name}.")
+
+    return crossover
+
+
+def batch_crossover_by_name(name: Literal['one-point', 'two-point', 'biased-uniform', 'uniform', 'layer', 'blend']) -> Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray, tuple[tuple[int,str]]], None]:
+    """Return batched crossover function from name."""
+
+    crossovers = {
+        'one-point': batch_one_point_crossover,
+        'two-point': batch_two_point_crossover,
+        'biased-uniform': batch_biased_uniform_crossover,
+        'uniform': batch_uniform_crossover,
+        'layer': batch_layer_crossover,
+        'blend': batch_blend_crossover,
     }
 
     try:
@@ -65,4 +248,4 @@ def crossover_by_name(name: Literal['one-point', 'uniform']) -> Callable[[Genome
     except KeyError:
         raise TypeError(f"Invalid crossover function {name}.")
 
-    return crossover
\ No newline at end of file
+    return crossover
@@ -5,45 +5,138 @@ import numpy as np
 from genetic_algorithm.genome import Genome
 
 
-def gaussian_mutation(genome: Genome, mutation_rate: float) -> None:
+#mutations only draw random numbers for the genes that actually mutate: the number of mutated genes is drawn from a
+#binomial distribution and then that many distinct genes are picked, so a low mutation_rate means little work.
+#A Genome's own mutation_step, if it has one, is used in place of the mutation_step given.
+
+
+def gaussian_mutation(genome: Genome, mutation_rate: float, mutation_step: float = 0.2) -> None:
     """Perform a gaussian mutation for each gene in a Genome with probability mutation_rate.
-    
-    Each gene selected for mutation will have a value ~N(0,0.2) added to it.
+
+    Each gene selected for mutation will have a value ~N(0,mutation_step) added to it.
     If a genes value becomes out of the range [-1,1] it will be clipped to it.
     """
 
-    for layer in genome.layers:
-        for arr in [layer.bias, layer.weights]:
-                mutation = np.random.normal(size=arr.shape) * 0.2
-                mask = np.random.random(size=arr.shape) < mutation_rate
-                arr[mask] += mutation[mask]
-                np.clip(arr, -1, 1, out=arr)
+    batch_gaussian_mutation(genome.flat_parameters()[np.newaxis], mutation_rate, _steps(genome, mutation_step))
 
 
-def uniform_mutation(genome: Genome, mutation_rate: float) -> None:
+def uniform_mutation(genome: Genome, mutation_rate: float, mutation_step: float = 0.2) -> None:
     """Randomly mutate each gene in a Genome with probability mutation_rate.
-    
-    Each gene selected for mutation will be assigned a new value ~U[-1,1].
+
+    Each gene selected for mutation will have a value ~U[-1,1] added to it.
+    If a genes value becomes out of the range [-1,1] it will be clipped to it.
     """
 
-    for layer in genome.layers:
-        for arr in [layer.bias, layer.weights]:
-                mutation = np.random.uniform(-1, 1, size=arr.shape)
-                mask = np.random.random(size=arr.shape) < mutation_rate
-                arr[mask] += mutation[mask]
+    batch_uniform_mutation(genome.flat_parameters()[np.newaxis], mutation_rate, _steps(genome, mutation_step))
+
+
+def self_adaptive_mutation(genome: Genome, mutation_rate: float, mutation_step: float = 0.2) -> None:
+    """Perform a gaussian mutation with the Genome's own step size, after mutating the step size itself.
+
+    The step size is multiplied by e^(N(0,1)/sqrt(parameter count)) and stored as the Genome's mutation_step so that
+    offspring inherit it, letting step sizes that produce fit offspring spread through the population.
+    """
+
+    steps = _steps(genome, mutation_step)
+    batch_self_adaptive_mutation(genome.flat_parameters()[np.newaxis], mutation_rate, steps)
+    genome.mutation_step = float(steps[0])
+
+
+def batch_gaussian_mutation(parameters: np.ndarray, mutation_rate: float, mutation_steps: np.ndarray) -> None:
+    """Perform gaussian_mutation on every row of a (Genomes, parameter count) array at once.
+
+    Row i is mutated with step size mutation_steps[i].
+    """
+
+    rows, columns = _mutated_genes(parameters.shape, mutation_rate)
+    mutated = parameters[rows, columns] + np.random.normal(size=len(rows)) * mutation_steps[rows]
+    parameters[rows, columns] = np.clip(mutated, -1, 1, out=mutated)
+
+
+def batch_uniform_mutation(parameters: np.ndarray, mutation_rate: float, mutation_steps: np.ndarray) -> None:
+    """Perform uniform_mutation on every row of a (Genomes, parameter count) array at once."""
+
+    rows, columns = _mutated_genes(parameters.shape, mutation_rate)
+    mutated = parameters[rows, columns] + np.random.uniform(-1, 1, size=len(rows))
+    parameters[rows, columns] = np.clip(mutated, -1, 1, out=mutated)
+
+
+def batch_self_adaptive_mutation(parameters: np.ndarray, mutation_rate: float, mutation_steps: np.ndarray) -> np.ndarray:
+    """Perform self_adaptive_mutation on every row of a (Genomes, parameter count) array at once.
+
+    The mutation_steps are mutated in place and returned.
+    """
+
+    mutation_steps *= np.exp(np.random.normal(size=len(mutation_steps)) / np.sqrt(parameters.shape[1]))
+    batch_gaussian_mutation(parameters, mutation_rate, mutation_steps)
+    return mutation_steps
+
+
+def _steps(genome: Genome, mutation_step: float) -> np.ndarray:
+    """Return the step size to mutate the Genome with as an array of one row's steps."""
 
+    return np.array([mutation_step if genome.mutation_step is None else genome.mutation_step])
 
-def mutation_by_name(name: Literal['gaussian', 'uniform']) -> Callable[[Genome, float], None]:
+
+def _mutated_genes(shape: tuple[int, int], mutation_rate: float) -> tuple[np.ndarray, np.ndarray]:
+    """Return the (rows, columns) of the genes of an array of given shape picked to mutate, each with probability mutation_rate."""
+
+    gene_count = shape[0] * shape[1]
+    if mutation_rate > 0.25:
+        return np.divmod(np.flatnonzero(np.random.random(gene_count) < mutation_rate), shape[1])
+
+    mutation_count = np.random.binomial(gene_count, mutation_rate)
+
+    #draw with replacement and top up any duplicates, which is cheap when few genes mutate
+    genes = _distinct(np.random.randint(0, gene_count, size=mutation_count))
+    while len(genes) < mutation_count:
+        genes = _distinct(np.concatenate((genes, np.random.randint(0, gene_count, size=mutation_count - len(genes)))))
+
+    return np.divmod(genes, shape[1])
+
+
+def _distinct(genes: np.ndarray) -> np.ndarray:
+    """Return the distinct genes in sorted order."""
+
+    genes.sort()
+    distinct = np.empty(len(genes), dtype=bool)
+    distinct[:1] = True
+    np.not_equal(genes[1:], genes[:-1], out=distinct[1:])
+    return genes[distinct]
+
+
+def mutation_by_name(name: Literal['gaussian', 'uniform', 'self-adaptive']) -> Callable[[Genome, float, float], None]:
     """Return mutation function from name."""
 
     mutations = {
         'gaussian': gaussian_mutation,
         'uniform': uniform_mutation,
+        'self-adaptive': self_adaptive_mutation,
+    }
+
+    try:
+        mutation = mutations[name]
+    except KeyError:
+         raise TypeError(f"Invalid mutation function {name}.")
+
+    return mutation
+
+
+def batch_mutation_by_name(name: Literal['gaussian', 'uniform', 'self-adaptive']) -> Callable[[np.ndarray, float, np.ndarray], np.ndarray | None]:
+    """Return batched mutation function from name.
+
+    Batched mutations that adapt the step sizes return them, the others return None.
+    """
+
+    mutations = {
+        'gaussian': batch_gaussian_mutation,
+        'uniform': batch_uniform_mutation,
+        'self-adaptive': batch_self_adaptive_mutation,
     }
-    
+
     try:
         mutation = mutations[name]
     except KeyError:
          raise TypeError(f"Invalid mutation function {name}.")
 
-    return mutation
\ No newline at end of file
+    return mutation
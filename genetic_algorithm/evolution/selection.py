@@ -1,30 +1,163 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import Callable, Literal
+
 import numpy as np
 
 from genetic_algorithm.base_player import BasePlayer
 
 
+class Selection(ABC):
+    """Abstract base class for picking parents from a generation's fitnesses.
+    
+    Subclasses do all of their preparation on construction, once per generation, and then pick in bulk.
+    """
+
+    @abstractmethod
+    def sample(self, count: int) -> np.ndarray:
+        """Return the indices of count picked parents."""
+        pass
+
+    def pairs(self, count: int) -> np.ndarray:
+        """Return a (count, 2) array of indices of pairs of distinct parents.
+        
+        The second parent of any pair that picked the same parent twice is redrawn, so for independent picks each pair is
+        distributed as if the two parents were picked without replacement.
+        """
+
+        pairs = self.sample(2 * count).reshape(count, 2)
+
+        #redraw the second parent of any pair that picked the same parent twice
+        clashes = pairs[:, 0] == pairs[:, 1]
+        while clashes.any():
+            pairs[clashes, 1] = self.sample(np.count_nonzero(clashes))
+            clashes = pairs[:, 0] == pairs[:, 1]
+
+        return pairs
+
+
+class FitnessWeightedSelection(Selection):
+    """Picks parents at rate proportional to their fitness.
+    
+    The fitnesses are checked and their cumulative sums computed once, after which every pick is a binary search.
+    Requires all parents have fitness >= 0.
+    Requires at least 2 parents have fitness > 0.
+    """
+
+    def __init__(self, fitnesses: Sequence[float]) -> None:
+        fitnesses = np.asarray(fitnesses, dtype=float)
+        _check_fitness(fitnesses)
+        self.cumulative_fitness = np.cumsum(fitnesses)
+
+    def _pick(self, spins: np.ndarray) -> np.ndarray:
+        """Return the indices of the parents whose slice of the wheel [0, total fitness) each spin lands in."""
+
+        picks = np.searchsorted(self.cumulative_fitness, spins, side='right')
+        return np.minimum(picks, len(self.cumulative_fitness) - 1, out=picks)
+
+    def sample(self, count: int) -> np.ndarray:
+        """Return the indices of count parents, each picked independently."""
+
+        return self._pick(np.random.uniform(0, self.cumulative_fitness[-1], count))
+
+
+class StochasticUniversalSelection(FitnessWeightedSelection):
+    """Picks parents at rate proportional to their fitness using evenly spaced pointers around the wheel.
+    
+    Every parent is picked within one of its expected number of times, so there is far less spread than with independent picks.
+    The picks are shuffled so that pairs are random. Has the same requirements as FitnessWeightedSelection.
+    """
+
+    def sample(self, count: int) -> np.ndarray:
+        """Return the indices of count parents, spread evenly over the wheel."""
+
+        if count == 0:
+            return np.empty(0, dtype=int)
+
+        spacing = self.cumulative_fitness[-1] / count
+        picks = self._pick((np.random.uniform(0, 1) + np.arange(count)) * spacing)
+        np.random.shuffle(picks)
+        return picks
+
+
+class RankSelection(FitnessWeightedSelection):
+    """Picks parents at rate linearly proportional to their rank by fitness.
+    
+    The best parent is picked pressure times as often as the average one and the worst 2 - pressure times, so a single
+    dominant parent can't take over and fitness can be negative. Pressure must be in [1, 2].
+    Requires at least 2 parents have a chance of being picked, so a pressure below 2 if there are only 2 parents.
+    """
+
+    def __init__(self, fitnesses: Sequence[float], pressure: float = 1.5) -> None:
+        if not 1 <= pressure <= 2:
+            raise Exception(f"The pressure of rank selection must be in [1, 2], not {pressure}.")
+
+        count = len(fitnesses)
+        ranks = np.empty(count)
+        ranks[np.argsort(fitnesses, kind='stable')] = np.arange(count)
+        weights = (2 - pressure) + 2 * (pressure - 1) * ranks / max(count - 1, 1)
+
+        if np.count_nonzero(weights) < 2:
+            raise Exception("To use rank selection at least two parents must have a chance of being picked. " +
+                            "Please keep more parents or use a pressure below 2.")
+        self.cumulative_fitness = np.cumsum(weights)
+
+
+class TournamentSelection(Selection):
+    """Picks the fittest of tournament_size parents chosen uniformly at random (with replacement).
+    
+    Only the order of the fitnesses matters, so they can be negative.
+    """
+
+    def __init__(self, fitnesses: Sequence[float], tournament_size: int = 3) -> None:
+        self.fitnesses = np.asarray(fitnesses, dtype=float)
+        self.tournament_size = tournament_size
+
+    def sample(self, count: int) -> np.ndarray:
+        """Return the indices of the winners of count tournaments."""
+
+        contestants = np.random.randint(0, len(self.fitnesses), size=(count, self.tournament_size))
+        winners = np.argmax(self.fitnesses[contestants], axis=1)
+        return contestants[np.arange(count), winners]
+
+
 def fitness_weighted_selection(parents: list[BasePlayer]) -> tuple[BasePlayer, BasePlayer]:
     """Picks 2 parents at rate proportional to their fitness.
     
     Requires all parents have fitness >= 0.
     Requires at least 2 parents have fitness > 0.
+    To pick many pairs from the same parents use FitnessWeightedSelection directly.
     """
 
-    fitness_table = [parent.fitness for parent in parents]
-    min_fitness = min(fitness_table)
-    max_fitness = max(fitness_table)
-    sum_fitness = sum(fitness_table)
+    i, j = FitnessWeightedSelection([parent.fitness for parent in parents]).pairs(1)[0]
+    return parents[i], parents[j]
 
-    if min_fitness < 0:
+
+def _check_fitness(fitnesses: np.ndarray) -> None:
+    """Raise an Exception if the fitnesses can't be used for fitness weighted selection."""
+
+    if np.min(fitnesses) < 0:
         raise Exception("To use fitness_weighted_selection all parents must have a fitness " +
                         "greater than or equal to zero. Please edit the calculate_fitness function.")
 
-    if max_fitness == sum_fitness:
+    if np.count_nonzero(fitnesses) < 2:
         raise Exception("To use fitness_weighted_selection at least two parents must have a " + 
                         "strictly positive fitness. Please edit the calculate_fitness function.")
 
-    wheel = sum(parent.fitness for parent in parents)
-    probabilities = [parent.fitness/wheel for parent in parents]
-    selection = np.random.choice(parents, 2, replace=False, p=probabilities)
 
-    return selection[0], selection[1]
\ No newline at end of file
+def selection_by_name(name: Literal['fitness-weighted', 'stochastic-universal', 'rank', 'tournament']) -> Callable[[Sequence[float]], Selection]:
+    """Return selection class from name."""
+
+    selections = {
+        'fitness-weighted': FitnessWeightedSelection,
+        'stochastic-universal': StochasticUniversalSelection,
+        'rank': RankSelection,
+        'tournament': TournamentSelection,
+    }
+
+    try:
+        selection = selections[name]
+    except KeyError:
+        raise TypeError(f"Invalid selection function {name}.")
+
+    return selection
\ No newline at end of file
@@ -0,0 +1,117 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+from typing import Callable
+
+from genetic_algorithm.base_player import BasePlayer
+from genetic_algorithm.genome import Genome
+from genetic_algorithm.population import Population
+
+
+class Executor(ABC):
+    """Abstract base class of the ways of simulating the players of a Population.
+
+    Subclasses implement simulate, which returns the fitness, score and best score of each of the given players.
+    They can also count the seconds their workers have spent simulating in busy_seconds, from which an instrumented
+    Population's worker utilization is found.
+    """
+
+    workers = 1
+    busy_seconds = None
+
+    def evaluate(self, population: Population) -> None:
+        """Simulate the players in the population that need it and assign them their fitness, score and best score.
+
+        Elites whose results are already up to date aren't simulated again (see Population.players_to_simulate), nor are
+        players whose Genomes are in the population's fitness cache, which are given their cached results instead.
+        """
+
+        with population.phase('simulate'):
+
+            indices = population.players_to_simulate()
+            if indices:
+                start, busy_seconds = time.perf_counter(), self.busy_seconds
+                results = self.simulate(population, indices)
+                if population.instrumentation is not None:
+                    busy_seconds = None if busy_seconds is None else self.busy_seconds - busy_seconds
+                    population.instrumentation.record_evaluations(len(indices), time.perf_counter() - start, busy_seconds, self.workers)
+
+                players = [population.players[i] for i in indices]
+                for player, (fitness, score, best_score) in zip(players, results):
+                    player.fitness = fitness
+                    player.score = score
+                    player.best_score = best_score
+
+            population.record_results(indices)
+
+    @abstractmethod
+    def simulate(self, population: Population, indices: list[int]) -> list[tuple[float, int, int]]:
+        """Return the fitness, score and best score of simulating the population's players at the given indices."""
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> Executor:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SerialExecutor(Executor):
+    """Simulates every Genome in turn in this process, with one player created by player_factory."""
+
+    def __init__(self, player_factory: Callable[[], BasePlayer], simulate: Callable[[BasePlayer], BasePlayer]) -> None:
+        self.player = player_factory()
+        self.simulate_player = simulate
+        self.busy_seconds = 0.0
+
+    def simulate(self, population: Population, indices: list[int]) -> list[tuple[float, int, int]]:
+        start = time.perf_counter()
+        results = [_simulate_genome(self.player, self.simulate_player, population.players[i].genome) for i in indices]
+        self.busy_seconds += time.perf_counter() - start
+        return results
+
+
+class ThreadExecutor(Executor):
+    """Simulates Genomes in a pool of threads, each with its own player created by player_factory.
+
+    Only worthwhile if the simulation spends most of its time outside the GIL (e.g. in large NumPy operations or waiting on I/O).
+    """
+
+    def __init__(self, player_factory: Callable[[], BasePlayer], simulate: Callable[[BasePlayer], BasePlayer], threads: int | None = None) -> None:
+        self.player_factory = player_factory
+        self.simulate_player = simulate
+        self.workers = threads or min(32, (os.cpu_count() or 1) + 4)     #ThreadPoolExecutor's default
+        self.pool = ThreadPoolExecutor(self.workers)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.busy_seconds = 0.0
+
+    def simulate(self, population: Population, indices: list[int]) -> list[tuple[float, int, int]]:
+        return list(self.pool.map(self._simulate_genome, [population.players[i].genome for i in indices]))
+
+    def _simulate_genome(self, genome: Genome) -> tuple[float, int, int]:
+        if not hasattr(self.local, 'player'):
+            self.local.player = self.player_factory()
+
+        start = time.perf_counter()
+        result = _simulate_genome(self.local.player, self.simulate_player, genome)
+        with self.lock:
+            self.busy_seconds += time.perf_counter() - start
+        return result
+
+    def close(self) -> None:
+        self.pool.shutdown()
+
+
+def _simulate_genome(player: BasePlayer, simulate: Callable[[BasePlayer], BasePlayer], genome: Genome) -> tuple[float, int, int]:
+    """Simulate the player with the given Genome and return its fitness, score and best score."""
+
+    player.genome = genome
+    player = simulate(player)
+    return player.fitness, player.score, player.best_score
@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from hashlib import blake2b
+
+from genetic_algorithm.genome import Genome
+
+
+class FitnessCache:
+    """Least recently used cache of simulation results, keyed by a hash of a Genome's structure and parameters.
+
+    Each Genome's results are averaged over its first evaluations simulations, and it is only simulated again until it
+    has had that many, so 1 suits deterministic simulations and more suit stochastic ones. Fitness and score are averaged
+    and the highest best score is kept.
+    At most capacity Genomes are cached, each entry taking roughly 300 bytes however big the Genome.
+    """
+
+    def __init__(self, capacity: int = 100_000, evaluations: int = 1) -> None:
+        self.capacity = capacity
+        self.evaluations = evaluations
+        self.entries = OrderedDict()    #key -> [simulations, fitness total, score total, best score]
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def key(genome: Genome) -> bytes:
+        """Return the 16 byte hash identifying the Genome's structure and parameters."""
+
+        hash = blake2b(repr(genome.structure).encode('utf-8'), digest_size=16)
+        hash.update(genome.flat_parameters().data)
+        return hash.digest()
+
+    def lookup(self, key: bytes) -> tuple[float, float, int] | None:
+        """Return the averaged fitness, score and best score for key if it has been simulated enough times, otherwise None."""
+
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < self.evaluations:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self._result(entry)
+
+    def record(self, key: bytes, fitness: float, score: float, best_score: int) -> tuple[float, float, int]:
+        """Add the result of one simulation of key and return its averaged fitness, score and best score so far."""
+
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [0, 0.0, 0, best_score]
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+
+        entry[0] += 1
+        entry[1] += fitness
+        entry[2] += score
+        entry[3] = max(entry[3], best_score)
+        return self._result(entry)
+
+    @staticmethod
+    def _result(entry: list) -> tuple[float, float, int]:
+        simulations, fitness_total, score_total, best_score = entry
+        if simulations == 1:
+            return fitness_total, score_total, best_score
+        return fitness_total / simulations, score_total / simulations, best_score
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
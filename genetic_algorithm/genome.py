@@ -5,7 +5,8 @@ import os
 import numpy as np
 
 from genetic_algorithm.layer import Layer
-from genetic_algorithm.activation_functions import sigmoid, relu, softmax, linear, activation_by_name
+from genetic_algorithm.activation_functions import sigmoid, relu, softmax, linear, activation_by_name, activation_name
+from genetic_algorithm.checkpoint import read_npy_header
 
 class Genome:
     """Neural network of given structure."""
@@ -13,34 +14,100 @@ class Genome:
     def __init__(self, birth_gen: int = 1) -> None:
         self.birth_gen = birth_gen
         self.layers = list()
+        self.parameters = None
+        self.mutation_step = None
+
+    @staticmethod
+    def parameter_count(structure: tuple[tuple[int,str]]) -> int:
+        """Return the number of parameters a Genome of given structure has."""
+
+        return sum(layer_properties[0] * (structure[i][0] + 1) for i, layer_properties in enumerate(structure[1:]))
 
     @classmethod
-    def new(cls, birth_gen: int, structure: tuple[tuple[int,str]]) -> Genome:
+    def new(cls, birth_gen: int, structure: tuple[tuple[int,str]], parameters: np.ndarray | None = None, dtype: np.dtype = np.float64) -> Genome:
         """Return a newly randomized Genome with given structure.
         
         Structure must be a tuple of tuples (size, activation).
+        If parameters is given it will be filled and the Genome's Layers will be views into it, otherwise a new array of given dtype is allocated.
+        Parameters will have values ~U[-1,1].
+        """
+
+        if parameters is None:
+            parameters = np.empty(cls.parameter_count(structure), dtype=dtype)
+        parameters[:] = np.random.uniform(-1, 1, len(parameters))
+
+        return cls.view(parameters, structure, birth_gen)
+
+    @classmethod
+    def view(cls, parameters: np.ndarray, structure: tuple[tuple[int,str]], birth_gen: int = 1) -> Genome:
+        """Return a Genome with given structure whose Layers are views into the flat array parameters.
+        
+        The parameters are not copied, so changes to the Genome are reflected in the array and vice versa.
         """
 
         genome = cls(birth_gen)
+        genome.parameters = parameters
+        genome.layers = cls._layer_views(parameters, structure)
+
+        return genome
+
+    @staticmethod
+    def _layer_views(parameters: np.ndarray, structure: tuple[tuple[int,str]]) -> list[Layer]:
+        """Return the Layers of given structure laid out consecutively in parameters."""
+
+        layers = list()
+        offset = 0
         for i, layer_properties in enumerate(structure[1:]):
             size = layer_properties[0]
             prev_size = structure[i][0]
+            count = size * (prev_size + 1)
             activation = activation_by_name(layer_properties[1])
-            genome.layers.append(Layer.new(size, prev_size, activation))
+            layers.append(Layer.view(parameters[offset:offset + count], size, prev_size, activation))
+            offset += count
 
-        return genome
+        return layers
+
+    @property
+    def structure(self) -> tuple[tuple[int,str]]:
+        return ((self.layers[0].weights.shape[1],),) + tuple((layer.size, activation_name(layer.activation)) for layer in self.layers)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.layers[0].weights.dtype
+
+    def flat_parameters(self) -> np.ndarray:
+        """Return the Genome's parameters as one flat array, first moving them into one if they aren't already."""
 
-    def propagate(self, input: np.ndarray) -> np.ndarray:
+        if self.parameters is None:
+            self.bind(np.empty(sum(layer.parameter_count for layer in self.layers), dtype=self.dtype))
+
+        return self.parameters
+
+    def bind(self, parameters: np.ndarray) -> None:
+        """Copy this Genome's parameters into the given flat array and make its Layers views into it."""
+
+        offset = 0
+        for layer in self.layers:
+            count = layer.parameter_count
+            layer.bind(parameters[offset:offset + count])
+            offset += count
+        self.parameters = parameters
+
+    def propagate(self, input: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
         """Return the final layer neurons obtained from feeding forward the given input.
         
         The input must already be in order and normalized.
+        Every layer computes into its own preallocated neurons, so the returned array is overwritten by the next call.
+        If out is given the final layer's neurons are written into it instead and it is returned.
         """
 
-        self.layers[0].propagate(input)
-        for layer_no, layer in enumerate(self.layers[1:]):
-            layer.propagate(self.layers[layer_no].neurons)
+        prev_neurons = input
+        for layer in self.layers[:-1]:
+            layer.propagate(prev_neurons)
+            prev_neurons = layer.neurons
+        self.layers[-1].propagate(prev_neurons, out)
 
-        return self.layers[-1].neurons
+        return self.layers[-1].neurons if out is None else out
 
     def __eq__(self, other):
         """Return True if both Genomes have the same structure and parameters."""
@@ -55,8 +122,30 @@ class Genome:
 
         return deepcopy(self)
 
-    def save(self, file_name: str, folder_name: str, fitness: float) -> None:
-        """Save neural network parameters to .npz."""
+    def __getstate__(self) -> dict:
+        """Pickle the flat parameters and the structure rather than every Layer."""
+
+        self.flat_parameters()
+        state = self.__dict__.copy()
+        state['layers'] = self.structure
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Rebuild the Layers as views into the unpickled parameters."""
+
+        structure = state.pop('layers')
+        self.__dict__.update(state)
+        self.layers = self._layer_views(self.parameters, structure)
+
+    def save(self, file_name: str, folder_name: str, fitness: float, dtype: np.dtype | None = None) -> None:
+        """Save neural network parameters to .npz.
+
+        The parameters are saved in their own dtype unless another is given, e.g. float16 to halve the size of the file.
+        If dtype is int8 the Genome is quantized for inference only: each layer's parameters are saved as multiples of
+        that layer's scale (its largest absolute parameter / 127) rounded to int8, along with the scale.
+        """
+
+        dtype = check_saved_dtype(dtype)
 
         #check folder exists, create if it doesn't
         if not os.path.exists(folder_name):
@@ -66,35 +155,106 @@ class Genome:
         genome_dict = dict()
         genome_dict['birth_gen'] = self.birth_gen
         genome_dict['fitness'] = fitness
-        genome_dict['save_structure'] = np.array([(layer.size, layer.activation.__name__) for layer in self.layers], dtype='int,S8')
+        if self.mutation_step is not None:
+            genome_dict['mutation_step'] = self.mutation_step
+        genome_dict['save_structure'] = np.array(list(self.structure[1:]), dtype='int,S8')
         for i, layer in enumerate(self.layers):
-            genome_dict[f'{i}_weights'] = layer.weights
-            genome_dict[f'{i}_bias'] = layer.bias
+            if dtype == np.int8:
+                scale = max(float(np.abs(layer.weights).max(initial=0)), float(np.abs(layer.bias).max(initial=0))) / 127 or 1.0
+                genome_dict[f'{i}_weights'] = np.rint(layer.weights / scale).astype(np.int8)
+                genome_dict[f'{i}_bias'] = np.rint(layer.bias / scale).astype(np.int8)
+                genome_dict[f'{i}_scale'] = np.float32(scale)
+            else:
+                genome_dict[f'{i}_weights'] = layer.weights if dtype is None else layer.weights.astype(dtype, copy=False)
+                genome_dict[f'{i}_bias'] = layer.bias if dtype is None else layer.bias.astype(dtype, copy=False)
 
         #save the file
         np.savez(f'{folder_name}/{file_name}', **genome_dict)
 
     @classmethod
-    def load(cls, file_name: str, folder_name: str) -> tuple[Genome, float]:
+    def load(cls, file_name: str, folder_name: str, lazy: bool = False, dtype: np.dtype | None = None) -> tuple[Genome, float]:
         """Load a neural network from a .npz file.
         
         The file must already exist.
-        The structure is gleaned from the file.
+        The structure and dtype are gleaned from the file, with int8 quantized parameters being dequantized to float32,
+        and the parameters are converted to dtype if it is given.
+        If lazy then only the structure and bookkeeping are read, and the parameters are read once they are first used (see LazyGenome).
         """
 
-        genome = cls()
-        
         #load the dictionary of files and the structure
-        genome_dict = np.load(f'{folder_name}/{file_name}')
-        genome.birth_gen = genome_dict['birth_gen']
-        fitness = genome_dict['fitness']
-        save_structure = genome_dict['save_structure']
-
-        #add the layers into the genome
-        for coord, layer_properties in np.ndenumerate(save_structure):
-            layer = Layer(layer_properties[0], activation_by_name(layer_properties[1].decode('utf-8')))
-            layer.weights = genome_dict[f'{coord[0]}_weights']
-            layer.bias = genome_dict[f'{coord[0]}_bias']
-            genome.layers.append(layer)
+        with np.load(f'{folder_name}/{file_name}') as genome_dict:
+            fitness = genome_dict['fitness']
+            save_structure = genome_dict['save_structure']
+            if lazy:
+                with genome_dict.zip.open('0_weights.npy') as file:
+                    shape, _, saved_dtype = read_npy_header(file)
+            else:
+                shape, saved_dtype = genome_dict['0_weights'].shape, genome_dict['0_weights'].dtype
+            input_size = shape[1]
+            if dtype is None:
+                dtype = np.float32 if saved_dtype == np.int8 else saved_dtype
+            structure = ((input_size,),) + tuple((int(size), activation.decode('utf-8')) for size, activation in save_structure)
+
+            if lazy:
+                genome = LazyGenome(file_name, folder_name, structure, genome_dict['birth_gen'], dtype)
+            else:
+                #fill the layers of a contiguous genome, dequantizing them if they were saved as int8
+                genome = cls.view(np.empty(cls.parameter_count(structure), dtype=dtype), structure, genome_dict['birth_gen'])
+                for i, layer in enumerate(genome.layers):
+                    weights, bias = genome_dict[f'{i}_weights'], genome_dict[f'{i}_bias']
+                    if f'{i}_scale' in genome_dict:
+                        scale = genome_dict[f'{i}_scale']
+                        weights, bias = weights * scale, bias * scale
+                    layer.weights[:] = weights
+                    layer.bias[:] = bias
+            if 'mutation_step' in genome_dict:
+                genome.mutation_step = float(genome_dict['mutation_step'])
 
         return genome, fitness
+
+
+class LazyGenome(Genome):
+    """Genome saved in a .npz file that reads its parameters from the file the first time they are used.
+
+    Until then only its structure, birth generation and mutation step are held, after which it behaves as a Genome.
+    """
+
+    def __init__(self, file_name: str, folder_name: str, structure: tuple[tuple[int,str]], birth_gen: int = 1,
+                 dtype: np.dtype = np.float64) -> None:
+        super().__init__(birth_gen)
+        del self.layers, self.parameters
+        self.file_name = file_name
+        self.folder_name = folder_name
+        self._structure = structure
+        self._dtype = np.dtype(dtype)
+
+    @property
+    def structure(self) -> tuple[tuple[int,str]]:
+        return self._structure
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    def __getattr__(self, name: str):
+        """Read the layers and parameters from the file when either is first looked up."""
+
+        if name not in ('layers', 'parameters'):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        genome, _ = Genome.load(self.file_name, self.folder_name, dtype=self._dtype)
+        self.layers = genome.layers
+        self.parameters = genome.parameters
+        return getattr(self, name)
+
+
+def check_saved_dtype(dtype: np.dtype | None) -> np.dtype | None:
+    """Return dtype as an np.dtype, checking that Genomes can be saved in it (a floating point dtype or int8)."""
+
+    if dtype is None:
+        return None
+
+    dtype = np.dtype(dtype)
+    if dtype != np.int8 and not np.issubdtype(dtype, np.floating):
+        raise Exception(f"Cannot save parameters as {dtype}, only as a floating point dtype or int8.")
+    return dtype
@@ -0,0 +1,176 @@
+from collections.abc import Iterator
+import os
+import zlib
+
+import numpy as np
+
+from genetic_algorithm.genome import Genome
+
+
+#a history store is a folder holding three files:
+#  structure.npz - the structure and dtype every saved Genome shares
+#  genomes.bin   - one zlib compressed chunk per append, holding the raw (Genomes, parameter count) array saved
+#  index.bin     - one INDEX_DTYPE record per saved Genome, locating its row within a chunk
+#both .bin files are only ever appended to, and the index after the chunk it refers to, so an interrupted append can
+#at worst leave unindexed bytes at the end of genomes.bin.
+INDEX_DTYPE = np.dtype([('generation', 'i8'), ('rank', 'i8'), ('best_score', 'f8'), ('fitness', 'f8'), ('birth_gen', 'i8'),
+                        ('mutation_step', 'f8'), ('offset', 'i8'), ('length', 'i8'), ('row', 'i8')])
+
+
+class HistoryStore:
+    """Append-only store of the Genomes saved each generation, indexed by generation, rank, best score and fitness.
+
+    Genomes are looked up through the index (see records) and only the chunks holding them are read and decompressed.
+    """
+
+    #zlib level the chunks are compressed with, parameters are close to random so higher levels gain little
+    compression_level = 1
+
+    def __init__(self, folder_name: str) -> None:
+        self.folder_name = folder_name
+        self._index = None
+        self._structure = None
+        self._dtype = None
+
+    @property
+    def structure(self) -> tuple[tuple[int,str]] | None:
+        self._read_header()
+        return self._structure
+
+    @property
+    def dtype(self) -> np.dtype | None:
+        self._read_header()
+        return self._dtype
+
+    def _read_header(self) -> None:
+        """Read the structure and dtype of the saved Genomes, if any have been saved."""
+
+        if self._structure is not None or not os.path.exists(f'{self.folder_name}/structure.npz'):
+            return
+
+        with np.load(f'{self.folder_name}/structure.npz') as header:
+            self._structure = ((int(header['input_size']),),) + tuple((int(size), activation.decode('utf-8'))
+                                                                      for size, activation in header['save_structure'])
+            self._dtype = np.dtype(str(header['dtype']))
+
+    def append(self, generation: int, parameters: np.ndarray, structure: tuple[tuple[int,str]], fitness: np.ndarray,
+               best_score: np.ndarray, birth_gen: np.ndarray, mutation_step: np.ndarray) -> int:
+        """Append one generation's saved Genomes, given best first.
+
+        Row i of parameters and element i of the other arrays belong to the Genome of rank i, and a mutation_step of NaN
+        means the Genome has none. Every Genome appended to a store must have the same structure and dtype.
+        Returns the number of bytes appended to the store.
+        """
+
+        if not os.path.exists(self.folder_name):
+            os.makedirs(self.folder_name)
+
+        #record the structure with the first append and check it on the rest
+        if self.structure is None:
+            header = dict()
+            header['input_size'] = structure[0][0]
+            header['save_structure'] = np.array(list(structure[1:]), dtype='int,S8')
+            header['dtype'] = parameters.dtype.str
+            np.savez(f'{self.folder_name}/structure', **header)
+        elif self.structure != tuple(structure) or self.dtype != parameters.dtype:
+            raise Exception(f"Cannot append Genomes of structure {structure} and dtype {parameters.dtype} to a history store of "
+                            f"structure {self.structure} and dtype {self.dtype}.")
+
+        chunk = zlib.compress(np.ascontiguousarray(parameters).tobytes(), self.compression_level)
+        with open(f'{self.folder_name}/genomes.bin', 'ab') as file:
+            offset = file.tell()
+            file.write(chunk)
+
+        records = np.empty(len(parameters), dtype=INDEX_DTYPE)
+        records['generation'] = generation
+        records['rank'] = np.arange(len(parameters))
+        records['best_score'] = best_score
+        records['fitness'] = fitness
+        records['birth_gen'] = birth_gen
+        records['mutation_step'] = mutation_step
+        records['offset'] = offset
+        records['length'] = len(chunk)
+        records['row'] = np.arange(len(parameters))
+        with open(f'{self.folder_name}/index.bin', 'ab') as file:
+            file.write(records.tobytes())
+
+        self._index = None
+        return len(chunk) + records.nbytes
+
+    @property
+    def index(self) -> np.ndarray:
+        """Every record in the store, in the order they were appended."""
+
+        if self._index is None:
+            try:
+                self._index = np.fromfile(f'{self.folder_name}/index.bin', dtype=INDEX_DTYPE)
+            except FileNotFoundError:
+                self._index = np.empty(0, dtype=INDEX_DTYPE)
+
+        return self._index
+
+    @property
+    def generations(self) -> np.ndarray:
+        """The generations that have Genomes in the store."""
+
+        return np.unique(self.index['generation'])
+
+    def records(self, generation: int | None = None) -> np.ndarray:
+        """Return the records of the given generation ordered by rank, or every record if generation is None."""
+
+        if generation is None:
+            return self.index
+
+        return self.index[self.index['generation'] == generation]
+
+    def genomes(self, records: np.ndarray) -> list[Genome]:
+        """Return the Genomes of the given records, in the same order.
+
+        Each chunk holding any of them is read and decompressed once.
+        """
+
+        genomes = [None] * len(records)
+        with open(f'{self.folder_name}/genomes.bin', 'rb') as file:
+            for offset in np.unique(records['offset']):
+                in_chunk = np.flatnonzero(records['offset'] == offset)
+                file.seek(offset)
+                chunk = zlib.decompress(file.read(records['length'][in_chunk[0]]))
+                parameters = np.frombuffer(chunk, dtype=self.dtype).reshape(-1, Genome.parameter_count(self.structure))
+
+                for i in in_chunk:
+                    record = records[i]
+                    genome = Genome.view(parameters[record['row']].copy(), self.structure, int(record['birth_gen']))
+                    if not np.isnan(record['mutation_step']):
+                        genome.mutation_step = float(record['mutation_step'])
+                    genomes[i] = genome
+
+        return genomes
+
+    def champion(self, generation: int) -> tuple[Genome, float]:
+        """Return the best Genome saved in the given generation and its fitness."""
+
+        records = self.records(generation)
+        if not len(records):
+            raise Exception(f"No Genomes from generation {generation} in history store {self.folder_name}.")
+
+        record = records[np.argmin(records['rank'])]
+        return self.genomes(record[np.newaxis])[0], float(record['fitness'])
+
+    def top(self, count: int) -> list[tuple[Genome, float]]:
+        """Return the count fittest Genomes ever saved and their fitness, fittest first."""
+
+        index = self.index
+        count = min(count, len(index))
+        if count < len(index):
+            index = index[np.argpartition(-index['fitness'], count - 1)[:count]]
+        records = index[np.argsort(-index['fitness'], kind='stable')]
+
+        return list(zip(self.genomes(records), records['fitness'].tolist()))
+
+    def replay(self) -> Iterator[tuple[int, list[Genome], np.ndarray]]:
+        """Yield every generation in the store in turn, with its Genomes (best first) and their records."""
+
+        for generation in self.generations:
+            records = self.records(generation)
+            records = records[np.argsort(records['rank'], kind='stable')]
+            yield int(generation), self.genomes(records), records
@@ -0,0 +1,166 @@
+from __future__ import annotations
+from contextlib import contextmanager
+import cProfile
+import csv
+import json
+from threading import Lock
+import time
+import tracemalloc
+from typing import Callable, Iterator, Literal
+
+
+#the phases of a generation that are timed, each logged as {phase}_seconds
+PHASES = ('load', 'simulate', 'rank', 'cull', 'repopulate', 'save', 'save_history', 'save_parents', 'save_checkpoint')
+
+#every field of a logged generation, in the order of a CSV log's columns
+FIELDS = ('generation', 'generation_seconds') + tuple(f'{phase}_seconds' for phase in PHASES) + \
+         ('evaluations', 'evaluations_per_second', 'worker_utilization', 'bytes_written', 'allocated_blocks', 'allocated_bytes', 'peak_memory')
+
+
+class Instrumentation:
+    """Records where the time of each generation goes and writes one record per generation to a log.
+
+    Each record holds the wall time of every phase (see PHASES) and of the generation as a whole, the number of
+    evaluations and evaluations per second of simulation, the fraction of the simulation time the workers spent
+    simulating and the bytes written by saves. Bytes written by background saves count towards the generation they finish in.
+    If trace_allocations is True, tracemalloc also records the net number of memory blocks and bytes allocated
+    and the peak memory of each generation, which slows everything down considerably.
+    If profile_generation is given, that generation is run under cProfile and its stats dumped to profile_file.
+    The log is JSON lines if format is 'jsonl' or CSV if 'csv', and on_generation is also called with each record if given.
+    """
+
+    def __init__(self, log_file: str, format: Literal['jsonl', 'csv'] = 'jsonl', trace_allocations: bool = False,
+                 profile_generation: int | None = None, profile_file: str | None = None,
+                 on_generation: Callable[[dict], None] | None = None) -> None:
+
+        match(format):
+            case 'jsonl':
+                self.file = open(log_file, 'a')
+                self.csv = None
+            case 'csv':
+                self.file = open(log_file, 'a', newline='')
+                self.csv = csv.DictWriter(self.file, FIELDS)
+                if self.file.tell() == 0:
+                    self.csv.writeheader()
+            case _:
+                raise TypeError(f'Invalid log format {format}')
+
+        self.trace_allocations = trace_allocations
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.profile_generation = profile_generation
+        self.profile_file = profile_file or f'{log_file}.{profile_generation}.prof'
+        self.profiler = None
+        self.on_generation = on_generation
+
+        self.lock = Lock()      #saves can finish in the background writer's thread
+        self.generation = None
+        self.depth = 0
+        self._start_generation(None)
+
+    def _start_generation(self, generation: int | None) -> None:
+        """Reset the records for the given generation."""
+
+        self.generation = generation
+        self.generation_start = time.perf_counter()
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.evaluations = 0
+        self.busy_seconds = None
+        self.worker_seconds = 0.0
+        with self.lock:
+            self.bytes_written = 0
+
+        if self.trace_allocations:
+            self.blocks = self._traced_blocks()
+            self.traced_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        if generation is not None and generation == self.profile_generation:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def _end_generation(self) -> None:
+        """Log the records of the current generation, if it has any."""
+
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.profile_file)
+            self.profiler = None
+
+        if self.generation is None:
+            return
+
+        record = {'generation': self.generation, 'generation_seconds': time.perf_counter() - self.generation_start}
+        record.update((f'{phase}_seconds', seconds) for phase, seconds in self.seconds.items())
+        record['evaluations'] = self.evaluations
+        record['evaluations_per_second'] = self.evaluations / self.seconds['simulate'] if self.seconds['simulate'] else None
+        record['worker_utilization'] = self.busy_seconds / self.worker_seconds if self.busy_seconds is not None and self.worker_seconds else None
+        with self.lock:
+            record['bytes_written'] = self.bytes_written
+
+        if self.trace_allocations:
+            traced_bytes, peak = tracemalloc.get_traced_memory()
+            record['allocated_blocks'] = self._traced_blocks() - self.blocks
+            record['allocated_bytes'] = traced_bytes - self.traced_bytes
+            record['peak_memory'] = peak
+        else:
+            record.update(allocated_blocks=None, allocated_bytes=None, peak_memory=None)
+
+        if self.csv is None:
+            self.file.write(json.dumps(record) + '\n')
+        else:
+            self.csv.writerow(record)
+        self.file.flush()
+
+        if self.on_generation is not None:
+            self.on_generation(record)
+
+    @staticmethod
+    def _traced_blocks() -> int:
+        return sum(statistic.count for statistic in tracemalloc.take_snapshot().statistics('filename'))
+
+    @contextmanager
+    def phase(self, name: str, generation: int) -> Iterator[None]:
+        """Time the phase of the given generation, logging the previous generation first if this is a new one.
+
+        Phases nested in another (e.g. the rank in a cull) count only towards the outermost one.
+        """
+
+        if self.depth == 0 and generation != self.generation:
+            self._end_generation()
+            self._start_generation(generation)
+
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                self.seconds[name] += time.perf_counter() - start
+
+    def record_evaluations(self, count: int, seconds: float, busy_seconds: float | None, workers: int) -> None:
+        """Record count evaluations that took seconds, during which workers workers were simulating for busy_seconds in total (None if unknown)."""
+
+        self.evaluations += count
+        self.worker_seconds += seconds * workers
+        if busy_seconds is not None:
+            self.busy_seconds = (self.busy_seconds or 0.0) + busy_seconds
+
+    def counting_bytes(self, write_function: Callable[..., int | None]) -> Callable[..., None]:
+        """Return write_function wrapped to add the number of bytes it returns to the bytes written."""
+
+        def write(*args) -> None:
+            written = write_function(*args)
+            if written is not None:
+                with self.lock:
+                    self.bytes_written += written
+
+        return write
+
+    def close(self) -> None:
+        """Log the last generation and close the log."""
+
+        self._end_generation()
+        self.generation = None
+        self.file.close()
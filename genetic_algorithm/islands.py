@@ -0,0 +1,163 @@
+from multiprocessing import Process, Queue
+from queue import Empty
+import traceback
+from typing import Callable, Literal
+
+import numpy as np
+
+from genetic_algorithm.base_player import BasePlayer
+from genetic_algorithm.genome import Genome
+from genetic_algorithm.population import Population
+
+
+def neighbours(topology: Literal['ring', 'fully-connected'], island: int, islands: int) -> list[int]:
+    """Return the islands that the given island sends its migrants to."""
+
+    match(topology):
+        case 'ring':
+            return [(island + 1) % islands] if islands > 1 else []
+        case 'fully-connected':
+            return [other for other in range(islands) if other != island]
+        case _:
+            raise TypeError(f'Invalid migration topology {topology}')
+
+
+def _run_island(island: int, seed: int, model: dict, generations: int, inboxes: list[Queue], results: Queue) -> None:
+    """Evolve one island's Population for the given number of generations, exchanging migrants through the inboxes.
+
+    Puts the island's final Genomes' parameters and fitness, best first, (or None and the traceback of the error that stopped it) into results.
+    """
+
+    try:
+        np.random.seed(seed)
+        simulate = model['simulate']
+        population = Population(model['island_size'], [model['player_factory']() for _ in range(model['island_size'])], dtype=model['dtype'],
+                                player_factory=model['player_factory'])
+        population.new_genomes(model['structure'], model['contiguous'])
+        senders = sum(island in neighbours(model['topology'], other, len(inboxes)) for other in range(len(inboxes)))
+
+        for generation in range(1, generations + 1):
+
+            indices = population.players_to_simulate()
+            for i in indices:
+                simulate(population.players[i])
+            population.record_results(indices)
+
+            if generation % model['migration_interval'] == 0:
+                _migrate(population, model['migrants'], [inboxes[other] for other in neighbours(model['topology'], island, len(inboxes))],
+                         inboxes[island], senders)
+
+            if generation < generations:
+                population.cull(model['parent_percentage'])
+                population.repopulate(**model['repopulate_args'])
+
+        population.rank()
+        parameters = np.stack([player.genome.flat_parameters() for player in population.players])
+        results.put((island, parameters, np.array([player.fitness for player in population.players], dtype=float)))
+
+    except BaseException:
+        results.put((island, None, traceback.format_exc()))
+
+
+def _migrate(population: Population, migrants: int, outboxes: list[Queue], inbox: Queue, senders: int) -> None:
+    """Send copies of the population's best migrants players' Genomes to every outbox, then replace its worst players with those sent to it.
+
+    Waits until every island sending migrants to this one has done so, so migration happens at the same generation everywhere.
+    """
+
+    population.rank()
+    migrants = min(migrants, len(population.players))
+    best = population.players[:migrants]
+    message = (np.stack([player.genome.flat_parameters() for player in best]), np.array([player.fitness for player in best], dtype=float))
+    for outbox in outboxes:
+        outbox.put(message)
+
+    #the immigrants take the place of the worst players, keeping their fitness from the island they came from
+    structure = population.players[0].genome.structure
+    arrivals = [inbox.get() for _ in range(senders)]
+    worst = iter(reversed(population.players[migrants:]))
+    for parameters, fitness in arrivals:
+        for row, row_fitness in zip(parameters, fitness):
+            player = next(worst, None)
+            if player is None:
+                break
+            player.genome = Genome.view(row, structure, population.current_generation)
+            player.fitness = float(row_fitness)
+
+    population.invalidate()
+    population.rank()
+
+
+class IslandModel:
+    """Several Populations evolving in parallel, one per process, that periodically swap their best Genomes.
+
+    Each island simulates its own players and breeds its own offspring, so breeding as well as simulation is spread
+    across cores, while migration keeps good Genomes spreading between islands without them all converging at once.
+    Every migration_interval generations each island sends copies of its best migrants Genomes to its neighbours
+    (the next island for a 'ring' topology, every other island if 'fully-connected'), which replace their worst players.
+    Each generation an island culls to parent_percentage and then repopulates with repopulate_args (see Population.repopulate).
+    Every island's Genomes have parameters of the given dtype (contiguous if contiguous is True).
+    The player_factory and simulate function must be picklable (e.g. a module level class or functools.partial of one).
+    """
+
+    def __init__(self, player_factory: Callable[[], BasePlayer], simulate: Callable[[BasePlayer], BasePlayer],
+                 structure: tuple[tuple[int,str]], islands: int = 4, island_size: int = 100,
+                 topology: Literal['ring', 'fully-connected'] = 'ring', migration_interval: int = 5, migrants: int = 2,
+                 parent_percentage: float = 0.2, contiguous: bool = False, dtype: np.dtype = np.float64, **repopulate_args) -> None:
+        neighbours(topology, 0, islands)    #check the topology exists before starting any processes
+        self.islands = islands
+        self.model = {
+            'player_factory': player_factory,
+            'simulate': simulate,
+            'structure': structure,
+            'island_size': island_size,
+            'topology': topology,
+            'migration_interval': migration_interval,
+            'migrants': migrants,
+            'parent_percentage': parent_percentage,
+            'contiguous': contiguous,
+            'dtype': dtype,
+            'repopulate_args': repopulate_args,
+        }
+
+    def run(self, generations: int) -> list[tuple[Genome, float]]:
+        """Evolve every island for the given number of generations and return all of their final Genomes with their fitness, fittest first."""
+
+        inboxes = [Queue() for _ in range(self.islands)]
+        results = Queue()
+        seeds = np.random.randint(0, 2**31, size=self.islands)
+        processes = [Process(target=_run_island, args=(island, int(seed), self.model, generations, inboxes, results), daemon=True)
+                     for island, seed in enumerate(seeds)]
+        for process in processes:
+            process.start()
+
+        #collect every island's Genomes, stopping them all if one fails as the rest could be waiting on its migrants
+        finished = []
+        try:
+            for _ in processes:
+                island, parameters, fitness = self._next_result(results, processes)
+                if parameters is None:
+                    raise Exception(f"Island {island} failed:\n{fitness}")
+                finished.extend((Genome.view(row, self.model['structure']), float(row_fitness)) for row, row_fitness in zip(parameters, fitness))
+        except BaseException:
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+
+        finished.sort(key=lambda genome: genome[1], reverse=True)
+        return finished
+
+    @staticmethod
+    def _next_result(results: Queue, processes: list[Process]) -> tuple:
+        """Wait for the next island to finish, checking that no island's process has died without reporting back."""
+
+        while True:
+            try:
+                return results.get(timeout=1)
+            except Empty:
+                for island, process in enumerate(processes):
+                    if process.exitcode not in (None, 0):
+                        raise Exception(f"Island {island} exited with code {process.exitcode}.")
@@ -20,23 +20,61 @@ class Layer:
         return len(self.neurons)
 
     @classmethod
-    def new(cls, size: int, prev_size: int, activation: Callable[[np.ndarray], np.ndarray]) -> Layer:
-        """Return a newly randomized Layer.
+    def new(cls, size: int, prev_size: int, activation: Callable[[np.ndarray], np.ndarray], dtype: np.dtype = np.float64) -> Layer:
+        """Return a newly randomized Layer with parameters of given dtype.
         
         Layer parameters will have values ~U[-1,1].
         """
 
         layer = cls(size, activation)
-        layer.weights = np.subtract(np.multiply(np.random.rand(size, prev_size), 2), 1)
-        layer.bias = np.subtract(np.multiply(np.random.rand(size), 2), 1)
+        layer.weights = np.subtract(np.multiply(np.random.rand(size, prev_size), 2), 1).astype(dtype, copy=False)
+        layer.bias = np.subtract(np.multiply(np.random.rand(size), 2), 1).astype(dtype, copy=False)
+        layer.neurons = np.zeros(size, dtype=dtype)
         
         return layer
 
-    def propagate(self, prev_neurons: np.ndarray) -> None:
-        """Compute this layer's neurons given the previous."""
+    @classmethod
+    def view(cls, parameters: np.ndarray, size: int, prev_size: int, activation: Callable[[np.ndarray], np.ndarray]) -> Layer:
+        """Return a Layer whose parameters are views into the given flat array.
+        
+        The array must have length size * (prev_size + 1), holding the weights followed by the bias.
+        """
+
+        layer = cls(size, activation)
+        layer.weights = parameters[:size * prev_size].reshape(size, prev_size)
+        layer.bias = parameters[size * prev_size:]
+        layer.neurons = np.zeros(size, dtype=parameters.dtype)
+
+        return layer
+
+    @property
+    def parameter_count(self) -> int:
+        return self.weights.size + self.bias.size
+
+    def bind(self, parameters: np.ndarray) -> None:
+        """Copy this layer's parameters into the given flat array and make them views into it."""
+
+        weights = parameters[:self.weights.size].reshape(self.weights.shape)
+        bias = parameters[self.weights.size:]
+        weights[:] = self.weights
+        bias[:] = self.bias
+        self.weights, self.bias = weights, bias
+        if self.neurons.dtype != parameters.dtype:
+            self.neurons = np.zeros(self.size, dtype=parameters.dtype)
+
+    def propagate(self, prev_neurons: np.ndarray, out: np.ndarray | None = None) -> None:
+        """Compute this layer's neurons given the previous.
+        
+        The neurons are computed in place in self.neurons, or in out if given (which must be contiguous and of the parameters' dtype).
+        Nothing is allocated unless prev_neurons has a different dtype to the parameters.
+        """
 
-        deactivated = np.add(np.dot(self.weights, prev_neurons), self.bias)
-        self.neurons = self.activation(deactivated)
+        neurons = self.neurons if out is None else out
+        if prev_neurons.dtype != self.weights.dtype:
+            prev_neurons = prev_neurons.astype(self.weights.dtype)
+        np.dot(self.weights, prev_neurons, out=neurons)
+        neurons += self.bias
+        self.activation(neurons, out=neurons)
 
     def __eq__(self, other: Layer) -> bool:
         """Return True if both Layers have the same size and parameters."""
@@ -0,0 +1,171 @@
+from collections.abc import Sequence
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable
+
+import numpy as np
+
+from genetic_algorithm.genome import Genome
+from genetic_algorithm.activation_functions import activation_by_name
+
+
+class ParameterStore:
+    """Contiguous (size, parameter count) array holding the parameters of a population's Genomes.
+
+    Row i holds the parameters of the i-th Genome adopted, whose Layers are views into that row.
+    If shared the array lives in shared memory, which other processes can attach to by self.memory.name.
+    Adopting and breeding write into a spare array of the same size (in shared memory too if shared), which is only
+    allocated the first time either is used. From then on, which for an evolving population is its first repack, the
+    store takes twice the memory of the parameters themselves.
+    """
+
+    def __init__(self, size: int, structure: tuple[tuple[int,str]], dtype: np.dtype = np.float64, shared: bool = False) -> None:
+        self.structure = structure
+        self.shared = shared
+        self.array, self.memory = self._allocate((size, Genome.parameter_count(structure)), dtype)
+        self._spare, self._spare_memory = None, None
+
+    def _allocate(self, shape: tuple[int, int], dtype: np.dtype) -> tuple[np.ndarray, SharedMemory | None]:
+        """Return an empty array of given shape, backed by a new block of shared memory if the store is shared."""
+
+        if not self.shared:
+            return np.empty(shape, dtype=dtype), None
+
+        memory = SharedMemory(create=True, size=max(1, shape[0] * shape[1] * np.dtype(dtype).itemsize))
+        return np.ndarray(shape, dtype=dtype, buffer=memory.buf), memory
+
+    @property
+    def size(self) -> int:
+        return self.array.shape[0]
+
+    @property
+    def parameter_count(self) -> int:
+        return self.array.shape[1]
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.array.dtype
+
+    def new_genomes(self, birth_gen: int, count: int | None = None) -> list[Genome]:
+        """Return count newly randomized Genomes that are views into the first count rows."""
+
+        count = self.size if count is None else count
+        return [Genome.new(birth_gen, self.structure, row) for row in self.array[:count]]
+
+    def adopt(self, genomes: Sequence[Genome]) -> None:
+        """Copy the Genomes' parameters into consecutive rows and make them views into those rows.
+
+        Rows are written into a spare buffer which then becomes the active one, so Genomes that are
+        already views into the store are never overwritten before being copied.
+        """
+
+        if len(genomes) > self.size:
+            raise Exception(f"Cannot adopt {len(genomes)} Genomes into a ParameterStore of size {self.size}.")
+
+        for genome, row in zip(genomes, self._spare_array()):
+            genome.bind(row)
+        self._swap()
+
+    def breed(self, survivors: Sequence[Genome], pairs: np.ndarray, offspring_count: int,
+              crossover: Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray, tuple[tuple[int,str]]], None],
+              mutate: Callable[[np.ndarray, float, np.ndarray], np.ndarray | None], mutation_rate: float,
+              mutation_steps: np.ndarray, birth_gen: int) -> list[Genome]:
+        """Write the next generation into the spare buffer and make it the active one.
+
+        The survivors are adopted into the first rows, followed by offspring_count offspring which are crossed over
+        from the pairs of rows given (two offspring per pair, in the order first parents then second parents) and then
+        mutated with the given step size for each offspring.
+        Returns the offspring Genomes, which are views into their rows, with their mutation_step set if mutate adapted it.
+        """
+
+        if len(survivors) + offspring_count > self.size:
+            raise Exception(f"Cannot breed {len(survivors) + offspring_count} Genomes into a ParameterStore of size {self.size}.")
+
+        parents = self.array
+        next_generation = self._spare_array()
+        for genome, row in zip(survivors, next_generation):
+            genome.bind(row)
+
+        offspring = next_generation[len(survivors):len(survivors) + offspring_count]
+        half = offspring_count // 2
+        crossover(parents[pairs[:half, 0]], parents[pairs[:half, 1]], offspring[:half], offspring[half:2 * half], self.structure)
+        if offspring_count % 2:
+            crossover(parents[pairs[half:, 0]], parents[pairs[half:, 1]], offspring[-1:], np.empty_like(offspring[-1:]), self.structure)
+        adapted_steps = mutate(offspring, mutation_rate, mutation_steps)
+
+        self._swap()
+        genomes = [Genome.view(row, self.structure, birth_gen) for row in offspring]
+        if adapted_steps is not None:
+            for genome, mutation_step in zip(genomes, adapted_steps.tolist()):
+                genome.mutation_step = mutation_step
+
+        return genomes
+
+    def _spare_array(self) -> np.ndarray:
+        """Return the spare array, allocating it if this is the first time it is needed."""
+
+        if self._spare is None:
+            self._spare, self._spare_memory = self._allocate(self.array.shape, self.dtype)
+        return self._spare
+
+    def _swap(self) -> None:
+        """Make the spare buffer the active one."""
+
+        self.array, self._spare = self._spare, self.array
+        self.memory, self._spare_memory = self._spare_memory, self.memory
+
+    def close(self) -> None:
+        """Release the shared memory backing the store, if any.
+
+        Any Genomes still viewing the store must be given their own parameters first (see Population.close).
+        """
+
+        if not self.shared:
+            return
+
+        self.array = self._spare = None
+        for memory in (self.memory, self._spare_memory):
+            if memory is None:
+                continue
+            memory.unlink()
+            try:
+                memory.close()
+            except BufferError:
+                pass    #views are still alive somewhere, the mapping is released once they are garbage collected
+        self.memory = self._spare_memory = None
+
+    def stacked_layers(self, rows: np.ndarray | None = None) -> list[tuple[np.ndarray, np.ndarray, Callable[[np.ndarray], np.ndarray]]]:
+        """Return (weights, bias, activation) for each layer, stacked across the given rows.
+
+        Weights have shape (N, size, prev_size) and bias (N, size).
+        If rows is None all rows are used and the arrays are views into the store, otherwise they are copies.
+        """
+
+        array = self.array if rows is None else self.array[rows]
+        layers = list()
+        offset = 0
+        for i, layer_properties in enumerate(self.structure[1:]):
+            size = layer_properties[0]
+            prev_size = self.structure[i][0]
+            weights = array[:, offset:offset + size * prev_size].reshape(-1, size, prev_size)
+            offset += size * prev_size
+            bias = array[:, offset:offset + size]
+            offset += size
+            layers.append((weights, bias, activation_by_name(layer_properties[1])))
+
+        return layers
+
+    @staticmethod
+    def propagate(layers: list[tuple[np.ndarray, np.ndarray, Callable[[np.ndarray], np.ndarray]]], inputs: np.ndarray) -> np.ndarray:
+        """Return the final layer neurons obtained from feeding forward each row of inputs through the stacked layers.
+
+        Inputs must have shape (N, input_size) where N matches the stacked layers.
+        One batched matrix multiplication is performed per layer, in the parameters' dtype (the inputs are converted to it).
+        """
+
+        neurons = np.asarray(inputs, dtype=layers[0][0].dtype)
+        for weights, bias, activation in layers:
+            neurons = np.matmul(weights, neurons[:, :, np.newaxis])[:, :, 0]
+            neurons += bias
+            activation(neurons, out=neurons)
+
+        return neurons
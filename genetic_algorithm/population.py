@@ -1,83 +1,519 @@
 import os
 import re
 from collections.abc import Sequence
-from typing import Literal
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from functools import partial, wraps
+import time
+from typing import Callable, Literal
 
 import numpy as np
 
 from genetic_algorithm.base_player import BasePlayer
 from genetic_algorithm.genome import Genome
-from genetic_algorithm.evolution.selection import fitness_weighted_selection
-from genetic_algorithm.evolution.crossover import one_point_crossover, uniform_crossover, crossover_by_name
-from genetic_algorithm.evolution.mutation import gaussian_mutation, uniform_mutation, mutation_by_name
+from genetic_algorithm.parameter_store import ParameterStore
+from genetic_algorithm.checkpoint import save_checkpoint, load_checkpoint, restore_random_state
+from genetic_algorithm.background_writer import BackgroundWriter
+from genetic_algorithm.history_store import HistoryStore
+from genetic_algorithm.fitness_cache import FitnessCache
+from genetic_algorithm.instrumentation import Instrumentation
+from genetic_algorithm.population_stats import PopulationStats
+from genetic_algorithm.evolution.selection import selection_by_name
+from genetic_algorithm.evolution.crossover import crossover_by_name, batch_crossover_by_name
+from genetic_algorithm.evolution.mutation import mutation_by_name, batch_mutation_by_name
+
+
+#the rank or generation a saved Genome's file name starts with
+_LEADING_NUMBER = re.compile(r"^\d+")
+
+
+def _phase(name: str) -> Callable[[Callable], Callable]:
+    """Decorate a Population method so that it is timed as the given phase if the population is instrumented."""
+
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def timed(self, *args, **kwargs):
+            with self.phase(name):
+                return method(self, *args, **kwargs)
+        return timed
+
+    return decorator
 
 
 class Population:
     """Population of (subclasses of) BasePlayers."""
 
-    def __init__(self, size: int, players: Sequence[BasePlayer], gen: int = 1) -> None:
+    def __init__(self, size: int, players: Sequence[BasePlayer], gen: int = 1, dtype: np.dtype = np.float64,
+                 player_factory: Callable[[], BasePlayer] | None = None) -> None:
         self.size = size
         self.players = players
         self.current_generation = gen
-    
+        self.dtype = np.dtype(dtype)    #of new and loaded Genomes' parameters
+        self.saved_dtype = None         #of saved Genomes' parameters, if not their own
+        self.player_factory = player_factory    #constructs the players for offspring, otherwise they are cloned from a parent
+        self.parameters = None
+        self.writer = None
+        self.fitness_cache = None
+        self.instrumentation = None
+        self.recycled = None    #culled players waiting to be reused for offspring, if recycling
+        self.evaluated = 0      #the first evaluated players have up to date results, the rest need simulating
+
+    @property
+    def players(self) -> Sequence[BasePlayer]:
+        return self._players
+
+    @players.setter
+    def players(self, players: Sequence[BasePlayer]) -> None:
+        """Replace the players, all of which then need simulating."""
+
+        self._players = players
+        self.evaluated = 0
+        self.invalidate()
+
+    @property
+    def fitness(self) -> np.ndarray:
+        """The fitness of every player, in the order of self.players."""
+
+        if self._fitness is None:
+            self._fitness = self._read_fitness()
+        return self._fitness
+
+    def _read_fitness(self) -> np.ndarray:
+        return np.fromiter((player.fitness for player in self.players), dtype=float, count=len(self.players))
+
+    @property
+    def stats(self) -> PopulationStats:
+        """Summary statistics of the players' fitness, computed once until the players or their results next change.
+
+        Results assigned through the population (e.g. by an Executor or record_results) keep them up to date, but after
+        assigning players' fitness directly call invalidate.
+        """
+
+        if self._stats is None:
+            self._stats = PopulationStats(self.fitness, self._parameter_rows)
+        return self._stats
+
+    def invalidate(self) -> None:
+        """Forget the cached fitness and stats, as the players or their results have changed."""
+
+        self._fitness = None
+        self._stats = None
+        self._ranked = 0    #the number of players at the front known to be in order of fitness
+
+    def _parameter_rows(self) -> np.ndarray:
+        """Return every player's parameters as the rows of one array, which is the ParameterStore's own if there is one."""
+
+        if self.parameters is not None:
+            self.sync_parameters()
+            return self.parameters.array[:len(self.players)]
+        return np.stack([player.genome.flat_parameters() for player in self.players])
+
     @property
     def average_fitness(self) -> float:
-        return (sum(player.fitness for player in self.players) / float(len(self.players)))
+        return self.stats.mean
     
     @property
     def champ(self) -> BasePlayer:
-        return max(self.players, key = lambda player: player.fitness)
+        return self.players[self.stats.champ]
     
-    def new_genomes(self, structure: tuple[tuple[int,str]]) -> None:
+    def new_genomes(self, structure: tuple[tuple[int,str]], contiguous: bool = False, dtype: np.dtype | None = None, shared: bool = False) -> None:
         """Fill the population with newly randomized Genomes of given structure.
         
         Structure must be a tuple of tuples (size, activation).
+        The parameters have the given dtype, defaulting to the population's.
+        If contiguous is True the Genomes' parameters will all be held in one ParameterStore,
+        which is placed in shared memory if shared is True.
         """
 
+        dtype = self.dtype if dtype is None else dtype
+        self.evaluated = 0
+        self.invalidate()
+        if contiguous:
+            self.parameters = ParameterStore(self.size, structure, dtype, shared)
+            for player, genome in zip(self.players, self.parameters.new_genomes(1, len(self.players))):
+                player.genome = genome
+            return
+
         for player in self.players:
-            player.genome = Genome.new(1, structure)
+            player.genome = Genome.new(1, structure, dtype=dtype)
+
+    def pack(self, dtype: np.dtype | None = None, shared: bool = False) -> None:
+        """Move the parameters of every Genome into one contiguous ParameterStore of given dtype, defaulting to the population's.
+        
+        Once packed, row i of the store belongs to self.players[i] through ranking, culling, repopulating and loading.
+        If shared is True the store is placed in shared memory so worker processes can read it without copying.
+        """
+
+        self.parameters = ParameterStore(self.size, self.players[0].genome.structure, self.dtype if dtype is None else dtype, shared)
+        self._repack()
+
+    def close(self) -> None:
+        """Finish any background saves, then give every Genome its own copy of its parameters and release the ParameterStore's shared memory, if any."""
+
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+        if self.instrumentation is not None:
+            self.instrumentation.close()
+            self.instrumentation = None
+
+        if self.parameters is None or not self.parameters.shared:
+            return
+
+        for player in self.players:
+            player.genome.bind(np.empty_like(player.genome.parameters))
+        self.parameters.close()
+        self.parameters = None
+
+    def use_fitness_cache(self, capacity: int = 100_000, evaluations: int = 1) -> None:
+        """Remember the results of simulating each Genome so that Genomes seen before (e.g. surviving parents) aren't simulated again.
+
+        Each Genome is simulated up to evaluations times, with its results averaged, before its cached results are reused
+        (see FitnessCache). At most capacity Genomes are remembered, the least recently used being forgotten first.
+        """
+
+        self.fitness_cache = FitnessCache(capacity, evaluations)
+
+    def instrument(self, log_file: str, format: Literal['jsonl', 'csv'] = 'jsonl', trace_allocations: bool = False,
+                   profile_generation: int | None = None, on_generation: Callable[[dict], None] | None = None) -> None:
+        """Log the time taken by each phase of every generation, along with evaluation throughput, worker utilization and bytes written.
+
+        One record per generation is written to log_file, as JSON lines or CSV, once the next generation starts (or on close).
+        See Instrumentation for the recorded fields, allocation tracing and profiling of profile_generation.
+        """
+
+        self.instrumentation = Instrumentation(log_file, format, trace_allocations, profile_generation, on_generation=on_generation)
+
+    def phase(self, name: str) -> AbstractContextManager:
+        """Return a context manager timing the phase (one of instrumentation.PHASES) of the current generation if instrumented."""
+
+        if self.instrumentation is None:
+            return nullcontext()
+
+        return self.instrumentation.phase(name, self.current_generation)
+
+    def save_parameters_as(self, dtype: np.dtype) -> None:
+        """Save the parameters of every Genome saved from now on (in files, checkpoints and history stores) as dtype.
+
+        E.g. float16 halves the disk used by float32 Genomes. Genomes are converted back to the population's dtype when loaded.
+        The dtype must be a floating point one, int8 quantization is only for exporting single Genomes (see Genome.save).
+        """
+
+        dtype = np.dtype(dtype)
+        if not np.issubdtype(dtype, np.floating):
+            raise Exception(f"Cannot save a population's parameters as {dtype}, only as a floating point dtype.")
+        self.saved_dtype = dtype
+
+    def recycle_players(self) -> None:
+        """Reuse the players removed by cull (and repopulate's non-elite parents) for offspring rather than creating new ones.
+
+        Removed players are reset (see BasePlayer.reset) as they are reused, so they mustn't be used elsewhere once removed.
+        All the players should be interchangeable, e.g. of the same class and created with the same arguments.
+        """
+
+        if self.recycled is None:
+            self.recycled = []
+
+    def recycle(self, players: Sequence[BasePlayer]) -> None:
+        """Keep the removed players for reuse if recycling, up to the size of the population."""
+
+        if self.recycled is not None:
+            self.recycled.extend(players[:self.size - len(self.recycled)])
+
+    def blank_player(self, parent: BasePlayer) -> BasePlayer:
+        """Return a player without a Genome to hold an offspring of parent.
+
+        A removed player is reused if recycling, otherwise a new one is made by the player_factory if there is one,
+        and only failing that by parent.empty_clone (which deep copies the parent).
+        """
+
+        if self.recycled:
+            player = self.recycled.pop()
+            player.reset()
+            return player
+
+        if self.player_factory is not None:
+            return self.player_factory()
+
+        return parent.empty_clone()
+
+    def players_to_simulate(self) -> list[int]:
+        """Return the indices of the players whose results aren't up to date and so need simulating.
+
+        These are the players that aren't elites carried over unchanged from the previous generation (see repopulate).
+        If the population has a fitness cache, those whose Genomes have cached results are given them and not returned.
+        """
+
+        unevaluated = range(self.evaluated, len(self.players))
+        if self.fitness_cache is None:
+            return list(unevaluated)
+
+        uncached = []
+        for i in unevaluated:
+            player = self.players[i]
+            result = self.fitness_cache.lookup(self.fitness_cache.key(player.genome))
+            if result is None:
+                uncached.append(i)
+            else:
+                player.fitness, player.score, player.best_score = result
+
+        self.invalidate()
+        return uncached
+
+    def record_results(self, indices: Sequence[int]) -> None:
+        """Mark every player's results as up to date once the players at the given indices (from players_to_simulate) have been simulated.
+
+        If the population has a fitness cache their results are added to it, and the players are then given their results
+        averaged over every time their Genome has been simulated.
+        """
+
+        self.evaluated = len(self.players)
+        self.invalidate()
+        if self.fitness_cache is None:
+            return
+
+        for i in indices:
+            player = self.players[i]
+            key = self.fitness_cache.key(player.genome)
+            player.fitness, player.score, player.best_score = self.fitness_cache.record(key, player.fitness, player.score, player.best_score)
+
+    def _packed(self) -> bool:
+        """Return whether every player's Genome is a view into the ParameterStore, as it is after a repack (trivially if there is no store).
+
+        Genomes assigned to players since (e.g. immigrants) aren't, even if the players' fitness hasn't changed.
+        """
+
+        if self.parameters is None:
+            return True
+
+        array = self.parameters.array
+        return all(player.genome.parameters is not None and player.genome.parameters.base is array for player in self.players)
+
+    def sync_parameters(self) -> None:
+        """Repack the ParameterStore if any player's Genome is no longer a view into it, e.g. after players or Genomes were reassigned.
+
+        Call before reading the store's rows directly, as they are otherwise only guaranteed to be the players' Genomes straight after a repack.
+        """
+
+        if not self._packed():
+            self._repack()
+
+    def _repack(self) -> None:
+        """Copy the Genomes into the ParameterStore (if there is one) in the order of self.players."""
 
-    def rank(self) -> None:
-        """Order players by fitness."""
+        if self.parameters is not None:
+            self.parameters.adopt([player.genome for player in self.players])
 
-        self.players.sort(key = lambda player: player.fitness, reverse=True)
+    def propagate_batch(self, inputs: np.ndarray, indices: np.ndarray | None = None) -> np.ndarray:
+        """Return the final layer neurons obtained from feeding forward each row of inputs through the corresponding player's Genome.
+        
+        Inputs must have shape (N, input_size), where row j belongs to self.players[indices[j]] (or self.players[j] if indices is None).
+        The population must have contiguous parameters (see new_genomes and pack).
+        """
+
+        if self.parameters is None:
+            raise Exception("Batched propagation requires contiguous parameters, see Population.pack.")
+
+        self.sync_parameters()
+        return ParameterStore.propagate(self.parameters.stacked_layers(indices), inputs)
+
+    @_phase('simulate')
+    def simulate_lockstep(self, indices: Sequence[int] | None = None) -> None:
+        """Simulate every player (or those at the given indices) in its environment simultaneously until all are dead.
+        
+        Each tick every living player looks, all of their Genome inputs are propagated together in one batch and each then carries out its move.
+        Players must implement genome_input and decide, and their fitness is not assigned.
+        The population must have contiguous parameters (see new_genomes and pack).
+        """
+
+        if self.parameters is None:
+            raise Exception("Lock-step simulation requires contiguous parameters, see Population.pack.")
+        self.sync_parameters()
+
+        start = time.perf_counter()
+        indices = range(len(self.players)) if indices is None else indices
+        for i in indices:
+            self.players[i].start_state()
+
+        alive = np.array([i for i in indices if not self.players[i].is_dead], dtype=int)
+        layers = self.parameters.stacked_layers(alive)
+        while len(alive):
+
+            living = [self.players[i] for i in alive]
+            for player in living:
+                player.look()
+            outputs = ParameterStore.propagate(layers, np.stack([player.genome_input() for player in living]))
+            for player, output in zip(living, outputs):
+                player.move(player.decide(output))
+
+            #only restack the Genomes when somebody has died
+            still_alive = np.array([not player.is_dead for player in living], dtype=bool)
+            if not still_alive.all():
+                alive = alive[still_alive]
+                layers = [(weights[still_alive], bias[still_alive], activation) for weights, bias, activation in layers]
+
+        if self.instrumentation is not None:
+            seconds = time.perf_counter() - start
+            self.instrumentation.record_evaluations(len(indices), seconds, seconds, 1)
+
+    @_phase('rank')
+    def rank(self, count: int | None = None) -> None:
+        """Order players by fitness.
+
+        If count is given only the count fittest players are moved to the front, in order, with the rest left behind them in
+        their current order, which takes a partial sort rather than a full one.
+        Players already in order aren't sorted again, unless their fitness has changed since, and the ParameterStore is only
+        repacked if they moved or it no longer holds every player's Genome.
+        """
+
+        if self._order(len(self.players) if count is None else count) or not self._packed():
+            self._repack()
+
+    def _order(self, count: int) -> bool:
+        """Move the count fittest players to the front in order (see rank), without repacking, and return whether any moved."""
 
+        count = min(count, len(self.players))
+        fitness = self._read_fitness()
+        if count == 0 or self._ranked >= count and self._fitness is not None and np.array_equal(fitness, self._fitness):
+            return False
+
+        #the top count in order, found by a partial sort keeping ties in their current order as a stable sort would
+        if count < len(fitness):
+            threshold = -np.partition(-fitness, count - 1)[count - 1]
+            above = np.flatnonzero(fitness > threshold)
+            top = np.concatenate((above, np.flatnonzero(fitness == threshold)[:count - len(above)]))
+            top = top[np.argsort(-fitness[top], kind='stable')]
+            rest = np.ones(len(fitness), dtype=bool)
+            rest[top] = False
+            order = np.concatenate((top, np.flatnonzero(rest)))
+        else:
+            order = np.argsort(-fitness, kind='stable')
+
+        #players that haven't been simulated can't be told apart from the rest once reordered
+        if self.evaluated < len(self.players):
+            self.evaluated = 0
+
+        self._players = [self.players[i] for i in order]
+        self._fitness = fitness[order]
+        self._stats = None
+        self._ranked = count
+        return True
+
+    @_phase('cull')
     def cull(self, percentage: float) -> None:
-        """Remove all but top percentage of players with highest fitness."""
+        """Remove all but top percentage of players with highest fitness.
+
+        For a steady-state population, where only the worst players are replaced each generation, cull with
+        percentage 1 - (fraction to replace) and repopulate keeping every survivor as an elite.
+        """
 
-        self.rank()
         num_left = max(int(self.size * percentage), 2)  #need at least 2 left to be able to repopulate 
+        reordered = self._order(num_left)
+        evaluated, fitness = min(self.evaluated, num_left), self.fitness[:num_left]
+        self.recycle(self.players[num_left:])
         self.players = self.players[:num_left]
+        self.evaluated, self._fitness, self._ranked = evaluated, fitness, len(fitness)
 
-    def repopulate(self, crossover_type: str, mutation_type: str, mutation_rate: float) -> None:
+        #only the survivors need to be moved into order in the ParameterStore
+        if reordered or not self._packed():
+            self._repack()
+
+    @_phase('repopulate')
+    def repopulate(self, crossover_type: str, mutation_type: str, mutation_rate: float, batched: bool = False,
+                   selection_type: str = 'fitness-weighted', mutation_step: float = 0.2, elites: int | None = None) -> None:
         """Add players to self.players until it has size self.size.
         
         Players are generated by crossing over two unique parents that are already in the population and then mutating the results.
+        Parents are picked according to selection_type, and mutation_step is the mutation step size for Genomes without their own.
+        If elites is None every parent stays in the population and is simulated again along with the offspring. Otherwise
+        only the best elites parents stay, unchanged and keeping their results, and just the offspring need simulating.
+        If batched then all the offspring are generated at once straight into the ParameterStore, which the population must have.
         """
 
+        if batched:
+            self.sync_parameters()  #the parents are bred from their rows in the ParameterStore
+        parents = self.players[:]
+        if elites is not None:
+            self.players = self.players[:elites]
+        self.evaluated = 0 if elites is None else len(self.players)
+
+        if batched:
+            self._batch_repopulate(parents, crossover_type, mutation_type, mutation_rate, selection_type, mutation_step)
+            self.recycle(parents[len(parents) if elites is None else elites:])
+            return
+
+        select = selection_by_name(selection_type)
         crossover = crossover_by_name(crossover_type)
         mutate = mutation_by_name(mutation_type)
         self.current_generation += 1
         
-        parents = self.players[:]
+        selection = select([parent.fitness for parent in parents])
+        pairs = iter(selection.pairs(max(self.size - len(self.players) + 1, 0) // 2))
         while len(self.players) < self.size:
 
-            parent1, parent2 = fitness_weighted_selection(parents)
-            offspring1, offspring2 = parent1.empty_clone(), parent2.empty_clone()
+            i, j = next(pairs)
+            parent1, parent2 = parents[i], parents[j]
+            offspring1, offspring2 = self.blank_player(parent1), self.blank_player(parent2)
             offspring1.genome, offspring2.genome = crossover(parent1.genome, parent2.genome, self.current_generation)
-            mutate(offspring1.genome, mutation_rate)
-            mutate(offspring2.genome, mutation_rate)
+            mutate(offspring1.genome, mutation_rate, mutation_step)
+            mutate(offspring2.genome, mutation_rate, mutation_step)
             self.players.extend([offspring1, offspring2])
             
-        if len(self.players) == self.size + 1: self.players.pop()   #adding 2 at a time can cause us to add one too many
+        if len(self.players) == self.size + 1: self.recycle([self.players.pop()])  #adding 2 at a time can cause us to add one too many
+        self.recycle(parents[len(parents) if elites is None else elites:])
+        self.invalidate()
+        self._repack()
+
+    def _batch_repopulate(self, parents: Sequence[BasePlayer], crossover_type: str, mutation_type: str, mutation_rate: float,
+                          selection_type: str, mutation_step: float) -> None:
+        """Add players to self.players until it has size self.size, breeding all of their Genomes from the parents in one go."""
+
+        if self.parameters is None:
+            raise Exception("Batched repopulation requires contiguous parameters, see Population.pack.")
 
-    def save_history(self, folder_name: str, type: Literal['none', 'champ', 'absolute', 'percentage', 'entire'], value: float = 0) -> None:
+        select = selection_by_name(selection_type)
+        crossover = batch_crossover_by_name(crossover_type)
+        mutate = batch_mutation_by_name(mutation_type)
+        self.current_generation += 1
+
+        offspring_count = self.size - len(self.players)
+        self.invalidate()
+        if offspring_count <= 0:
+            self._repack()
+            return
+
+        pairs = select([parent.fitness for parent in parents]).pairs((offspring_count + 1) // 2)
+
+        #the offspring are laid out as those of the first parents of each pair then those of the second parents
+        half = offspring_count // 2
+        parent_ids = np.concatenate((pairs[:half, 0], pairs[:half, 1], pairs[half:, 0]))
+        parent_steps = [parent.genome.mutation_step for parent in parents]
+        mutation_steps = np.array([mutation_step if parent_steps[i] is None else parent_steps[i] for i in parent_ids])
+
+        genomes = self.parameters.breed([player.genome for player in self.players], pairs, offspring_count,
+                                        crossover, mutate, mutation_rate, mutation_steps, self.current_generation)
+        for parent_id, genome in zip(parent_ids, genomes):
+            if genome.mutation_step is None:
+                genome.mutation_step = parent_steps[parent_id]
+            offspring = self.blank_player(parents[parent_id])
+            offspring.genome = genome
+            self.players.append(offspring)
+
+    @_phase('save_history')
+    def save_history(self, folder_name: str, type: Literal['none', 'champ', 'absolute', 'percentage', 'entire'], value: float = 0,
+                     backend: Literal['folders', 'store'] = 'folders') -> None:
         """Save current population's best players into folder folder_name.
         
         Type and value are used to determine how many players to save.
+        With the 'folders' backend each Genome is saved as its own file (in a folder per generation unless type is 'champ'),
+        with the 'store' backend they are appended to the HistoryStore in folder_name.
         Should not be used after a cull.
         """
 
+        #the store keeps every generation in the one folder
+        store_folder_name = folder_name
+
         match(type):
             case 'none':
                 return
@@ -103,20 +539,86 @@ class Population:
             case _:
                 raise TypeError(f'Invalid history type {type}')
 
-        self.save(count, folder_name, file_name_format, overwrite)
+        match(backend):
+            case 'folders':
+                self.save(count, folder_name, file_name_format, overwrite)
+            case 'store':
+                self.rank(count)
+                self._write(HistoryStore(store_folder_name).append, self.current_generation, *self._saved_columns(count))
+            case _:
+                raise TypeError(f'Invalid history backend {backend}')
+
+    def save_in_background(self, max_pending: int = 2) -> None:
+        """Carry out all future saves in a background thread so that they overlap with simulation.
+
+        Each save snapshots what it needs (one copy of the saved Genomes' parameters) and returns straight away.
+        If max_pending saves are already waiting to be written the next one blocks until one has finished.
+        Call flush to wait for the saves to finish and close (at the latest) to stop the thread.
+        """
+
+        if self.writer is None:
+            self.writer = BackgroundWriter(max_pending)
+
+    def flush(self) -> None:
+        """Wait for every background save to finish."""
+
+        if self.writer is not None:
+            self.writer.flush()
+
+    def _write(self, write_function: Callable[..., int | None], *args) -> None:
+        """Call write_function(*args) now or, if saving in the background, queue it.
 
-    def save_parents(self, folder_name: str) -> None:
+        If instrumented, the number of bytes write_function returns is added to the bytes written.
+        """
+
+        if self.instrumentation is not None:
+            write_function = self.instrumentation.counting_bytes(write_function)
+
+        if self.writer is None:
+            write_function(*args)
+        else:
+            self.writer.submit(write_function, *args)
+
+    def _snapshot(self, genomes: Sequence[Genome]) -> list[Genome]:
+        """Return the Genomes themselves or, if saving in the background, copies of them (sharing one new array)."""
+
+        if self.writer is None or not genomes:
+            return genomes
+
+        snapshots = []
+        for genome, parameters in zip(genomes, np.stack([genome.flat_parameters() for genome in genomes])):
+            snapshot = Genome.view(parameters, genome.structure, genome.birth_gen)
+            snapshot.mutation_step = genome.mutation_step
+            snapshots.append(snapshot)
+
+        return snapshots
+
+    @_phase('save_parents')
+    def save_parents(self, folder_name: str, checkpoint: bool = False) -> None:
         """Save generation and the Genomes of remaining players.
         
         Must be used after a cull.
+        If checkpoint is True they are saved as the single file {folder_name}/checkpoint.npz (see save_checkpoint) instead.
         """
 
+        if checkpoint:
+            self.save_checkpoint(f'{folder_name}/checkpoint.npz')
+            return
+
         self.save(len(self.players), folder_name, 'r')
 
         stats = dict()
         stats['current_generation'] = self.current_generation
+        self._write(self._save_stats, folder_name, stats)
+
+    @staticmethod
+    def _save_stats(folder_name: str, stats: dict) -> int:
+        """Save the stats into {folder_name}/stats.npz and return its size in bytes."""
+
         np.savez(f'{folder_name}/stats', **stats)
+        return os.path.getsize(f'{folder_name}/stats.npz')
 
+    @_phase('save')
     def save(self, count: int, folder_name: str, file_name_format: Literal['r', 'gs', 'rs'], overwrite: bool = True) -> None:
         """Save the top count players into the folder with path folder_name.
 
@@ -126,19 +628,11 @@ class Population:
         """
 
         #move the best players to the top
-        self.rank()
-
-        #check folder exists, create if it doesn't
-        if not os.path.exists(folder_name):
-            os.makedirs(folder_name)
-
-        #clear the folder
-        if overwrite:
-            for file in os.listdir(folder_name):
-                os.remove(f'{folder_name}/{file}')
-
-        #save the Genomes and record their fitness for repopulation
         count = min(count, len(self.players))
+        self.rank(count)
+
+        #name the Genomes and record their fitness for repopulation
+        file_names = []
         for rank, player in enumerate(self.players[:count]):
 
             match(file_name_format):
@@ -150,49 +644,153 @@ class Population:
                     file_name = f'{rank}_{player.best_score}'
                 case _:
                     raise TypeError(f'Invalid file name format {file_name_format}.')
-                
-            player.genome.save(file_name, folder_name, player.fitness)
+            file_names.append(file_name)
+
+        genomes = self._snapshot([player.genome for player in self.players[:count]])
+        self._write(self._save_genomes, folder_name, overwrite, genomes, file_names, [player.fitness for player in self.players[:count]], self.saved_dtype)
+
+    @staticmethod
+    def _save_genomes(folder_name: str, overwrite: bool, genomes: Sequence[Genome], file_names: Sequence[str], fitnesses: Sequence[float],
+                      dtype: np.dtype | None = None) -> int:
+        """Save each Genome with its file name and fitness (and parameters as dtype, if given) into the folder, clearing it first if overwrite is True.
+
+        Returns the total size of the saved files in bytes.
+        """
+
+        #check folder exists, create if it doesn't
+        if not os.path.exists(folder_name):
+            os.makedirs(folder_name)
+
+        #clear the folder
+        if overwrite:
+            for file in os.listdir(folder_name):
+                os.remove(f'{folder_name}/{file}')
+
+        for genome, file_name, fitness in zip(genomes, file_names, fitnesses):
+            genome.save(file_name, folder_name, fitness, dtype)
+
+        return sum(os.path.getsize(f'{folder_name}/{file_name}.npz') for file_name in file_names)
+
+    @_phase('save_checkpoint')
+    def save_checkpoint(self, file_name: str) -> None:
+        """Save every player's Genome, fitness and best score, the generation and the random state into one file.
+
+        Players are saved in their current order. The file is replaced atomically, so a crash mid-save leaves the previous checkpoint intact.
+        """
+
+        self._write(save_checkpoint, file_name, *self._saved_columns(len(self.players)), self.current_generation, np.random.get_state())
+
+    def _saved_columns(self, count: int) -> tuple[np.ndarray, tuple[tuple[int,str]], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return the parameters, structure, fitness, best scores, birth generations and mutation steps (NaN if None) of the first count players.
 
-    def load(self, folder_name: str) -> None:
+        The parameters are converted to the saved dtype if there is one. They are a copy if converted or saving in the background,
+        otherwise they may be the ParameterStore's own rows.
+        """
+
+        players = self.players[:count]
+        genomes = [player.genome for player in players]
+        if self.parameters is None:
+            parameters = np.stack([genome.flat_parameters() for genome in genomes])
+        else:
+            self.sync_parameters()
+            parameters = self.parameters.array[:len(players)]
+
+        if self.saved_dtype is not None and parameters.dtype != self.saved_dtype:
+            parameters = parameters.astype(self.saved_dtype)
+        elif self.parameters is not None and self.writer is not None:
+            parameters = parameters.copy()
+
+        return (parameters, genomes[0].structure,
+                np.array([player.fitness for player in players], dtype=float),
+                np.array([player.best_score for player in players]),
+                np.array([genome.birth_gen for genome in genomes]),
+                np.array([np.nan if genome.mutation_step is None else genome.mutation_step for genome in genomes]))
+
+    @_phase('load')
+    def load_checkpoint(self, file_name: str) -> None:
+        """Load a checkpoint saved with save_checkpoint into the population's players and restore the random state.
+
+        The Genomes' parameters are memory-mapped from the file (copy-on-write) unless the population has a ParameterStore to copy them into
+        or they were saved in a dtype other than the population's, in which case they are converted to it.
+        If there are more Genomes than players then the excess Genomes will be ignored.
+        If there are more players than Genomes then the additional players will be removed.
+        """
+
+        self.flush()
+        checkpoint = load_checkpoint(file_name)
+        structure = checkpoint['structure']
+        count = min(len(checkpoint['parameters']), len(self.players))
+        rows = checkpoint['parameters'][:count]
+        if self.parameters is None and rows.dtype != self.dtype:
+            rows = rows.astype(self.dtype)
+
+        for player, parameters, fitness, best_score, birth_gen, mutation_step in zip(
+                self.players[:count], rows, checkpoint['fitness'],
+                checkpoint['best_score'], checkpoint['birth_gen'], checkpoint['mutation_step']):
+            player.genome = Genome.view(parameters, structure, int(birth_gen))
+            if not np.isnan(mutation_step):
+                player.genome.mutation_step = float(mutation_step)
+            player.fitness = float(fitness)
+            player.best_score = best_score.item()
+
+        self.current_generation = checkpoint['current_generation']
+        restore_random_state(checkpoint)
+        self.players = self.players[:count]
+        self.evaluated = count
+        self._repack()
+
+    @_phase('load')
+    def load(self, folder_name: str, lazy: bool = False, threads: int | None = None) -> None:
         """Load Genomes saved in the given folder into the population's players.
         
+        If folder_name is a file it is loaded as a checkpoint (see load_checkpoint).
+        Otherwise the Genome files are read by a pool of threads (of default size if threads is None), and if lazy only
+        their structure and fitness are read, with their parameters being read when first used (see LazyGenome).
+        Parameters are converted to the population's dtype, whatever dtype they were saved in.
+        Every Genome must have the same structure.
         If there are more Genomes than players then the excess Genomes will be ignored.
         If there are more players than Genomes then the additional players will be removed.
         """
 
+        #make sure anything being saved in the background has been written
+        self.flush()
+
+        if os.path.isfile(folder_name):
+            self.load_checkpoint(folder_name)
+            return
+
         #check folder exists
         if not os.path.exists(folder_name):
             raise Exception("Prescribed load-from folder doesn't exist")
         
         #load the generation if applicable
         try:
-            stats = np.load(f'{folder_name}/stats.npz')
-            self.current_generation = stats['current_generation']
+            with np.load(f'{folder_name}/stats.npz') as stats:
+                self.current_generation = int(stats['current_generation'])
         except OSError:
             self.current_generation = 1
 
-        #prepare the list of files
-        file_names = os.listdir(folder_name)
-        try:
-            file_names.remove('stats.npz')
-        except Exception:
-            pass
-        finally:
-            file_names.sort(key = lambda file_name: int(re.search(r"^\d+", file_name).group()))
-
-        #load the Genomes and assign their fitness
-        id = 0
-        for file_name in file_names:
+        #prepare the list of files, only keeping as many as there are players to load genomes into
+        #only Genome files are named after a rank or generation, so stats.npz or a checkpoint.npz saved alongside them are skipped
+        file_names = [file_name for file_name in os.listdir(folder_name) if _LEADING_NUMBER.match(file_name)]
+        file_names.sort(key = lambda file_name: int(_LEADING_NUMBER.match(file_name).group()))
+        file_names = file_names[:len(self.players)]
 
-            if id > self.size: break    #run out of players to load genomes into
+        #load the Genomes and their corresponding fitness
+        with ThreadPoolExecutor(threads) as executor:
+            loaded = list(executor.map(partial(Genome.load, folder_name=folder_name, lazy=lazy, dtype=self.dtype), file_names))
 
-            #load the Genome and its corresponding fitness
-            genome, fitness = Genome.load(file_name, folder_name)
+        #check they all have the same structure
+        for file_name, (genome, _) in zip(file_names, loaded):
+            if genome.structure != loaded[0][0].structure:
+                raise Exception(f"Genome {file_name} has structure {genome.structure} but {file_names[0]} has structure {loaded[0][0].structure}.")
 
-            #add the Genome to a (unique) player
-            self.players[id].genome = genome
-            self.players[id].fitness = fitness
-            id += 1
+        #add each Genome to a (unique) player
+        for player, (genome, fitness) in zip(self.players, loaded):
+            player.genome = genome
+            player.fitness = fitness
 
         #remove the rest of the players
-        self.players = self.players[:id]
\ No newline at end of file
+        self.players = self.players[:len(loaded)]
+        self.evaluated = len(loaded)
+        self._repack()
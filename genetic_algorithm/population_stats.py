@@ -0,0 +1,37 @@
+from functools import cached_property
+from typing import Callable
+
+import numpy as np
+
+
+class PopulationStats:
+    """Summary statistics of a Population's fitness, computed together in one vectorized pass.
+
+    quantiles holds the fitness at each of QUANTILES, and champ is the index of the fittest player (the first if tied).
+    diversity, the mean over every parameter of its standard deviation across the Genomes, is only computed when first
+    used, from the (N, parameter count) array returned by parameters.
+    """
+
+    QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+    def __init__(self, fitness: np.ndarray, parameters: Callable[[], np.ndarray]) -> None:
+        self.fitness = fitness
+        self.parameters = parameters
+        self.mean = float(fitness.mean())
+        self.std = float(fitness.std())
+        self.min = float(fitness.min())
+        self.max = float(fitness.max())
+        self.quantiles = np.quantile(fitness, self.QUANTILES)
+        self.champ = int(np.argmax(fitness))
+
+    @property
+    def median(self) -> float:
+        return float(self.quantiles[self.QUANTILES.index(0.5)])
+
+    @cached_property
+    def diversity(self) -> float:
+        return float(self.parameters().std(axis=0).mean())
+
+    def __repr__(self) -> str:
+        return (f'PopulationStats(mean={self.mean:.4g}, std={self.std:.4g}, min={self.min:.4g}, max={self.max:.4g}, '
+                f'median={self.median:.4g}, champ={self.champ})')
@@ -0,0 +1,237 @@
+from __future__ import annotations
+from multiprocessing import Process, Queue as ProcessQueue
+from queue import Queue, Empty
+import socket
+import struct
+import threading
+import time
+import traceback
+from typing import Callable
+
+import numpy as np
+
+from genetic_algorithm.base_player import BasePlayer
+from genetic_algorithm.genome import Genome
+from genetic_algorithm.population import Population
+from genetic_algorithm.executors import Executor, _simulate_genome
+from genetic_algorithm.evaluator import RESULT_DTYPE
+
+
+#messages between a RemoteExecutor and a remote worker all start with one byte giving their type, and all numbers (parameters and results included) are little-endian:
+#  b'S' structure: u32 input size, u32 layer count, then per layer a u32 size and 8 byte activation name
+#  b'E' evaluate:  1 byte dtype character, u32 Genome count, u32 parameter count, then the raw (count, parameter count) parameters
+#  b'R' results:   u32 count, then count records of f8 fitness, i8 score and i8 best score
+#  b'X' error:     u32 length, then the utf-8 traceback of the simulation that failed
+#a worker replies to every evaluate message with results or an error, and only ever needs a structure before the first evaluate.
+_HEADER = struct.Struct('<c')
+_COUNT = struct.Struct('<I')
+_STRUCTURE = struct.Struct('<II')
+_LAYER = struct.Struct('<I8s')
+_EVALUATE = struct.Struct('<cII')
+_RESULTS = RESULT_DTYPE.newbyteorder('<')
+
+
+def _receive(connection: socket.socket, size: int) -> bytearray:
+    """Return exactly size bytes from the connection, raising ConnectionError if it closes first."""
+
+    data = bytearray(size)
+    view = memoryview(data)
+    received = 0
+    while received < size:
+        count = connection.recv_into(view[received:])
+        if not count:
+            raise ConnectionError("Connection closed mid-message.")
+        received += count
+
+    return data
+
+
+def _encode_structure(structure: tuple[tuple[int,str]]) -> bytes:
+    layers = b''.join(_LAYER.pack(size, activation.encode('utf-8')) for size, activation in structure[1:])
+    return b'S' + _STRUCTURE.pack(structure[0][0], len(structure) - 1) + layers
+
+
+def _receive_structure(connection: socket.socket) -> tuple[tuple[int,str]]:
+    input_size, layer_count = _STRUCTURE.unpack(_receive(connection, _STRUCTURE.size))
+    layers = _receive(connection, layer_count * _LAYER.size)
+    return ((input_size,),) + tuple((size, activation.rstrip(b'\0').decode('utf-8')) for size, activation in _LAYER.iter_unpack(layers))
+
+
+def serve(player_factory: Callable[[], BasePlayer], simulate: Callable[[BasePlayer], BasePlayer], host: str = '0.0.0.0', port: int = 0,
+          ready: ProcessQueue | None = None) -> None:
+    """Run a remote worker, simulating the Genomes sent by RemoteExecutors one connection at a time, forever.
+
+    Run one worker per core on each machine. If port is 0 a free port is picked, which is put into ready if given.
+    """
+
+    player = player_factory()
+    with socket.create_server((host, port)) as server:
+        if ready is not None:
+            ready.put(server.getsockname()[1])
+
+        while True:
+            connection, _ = server.accept()
+            with connection:
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                try:
+                    _serve_connection(connection, player, simulate)
+                except ConnectionError:
+                    pass
+
+
+def _serve_connection(connection: socket.socket, player: BasePlayer, simulate: Callable[[BasePlayer], BasePlayer]) -> None:
+    """Answer a RemoteExecutor's messages until it disconnects."""
+
+    structure = None
+    while True:
+        match(_HEADER.unpack(_receive(connection, _HEADER.size))[0]):
+            case b'S':
+                structure = _receive_structure(connection)
+            case b'E':
+                dtype, count, parameter_count = _EVALUATE.unpack(_receive(connection, _EVALUATE.size))
+                dtype = np.dtype(dtype.decode('ascii')).newbyteorder('<')
+                parameters = np.frombuffer(_receive(connection, count * parameter_count * dtype.itemsize), dtype=dtype).reshape(count, parameter_count)
+                parameters = parameters.astype(dtype.newbyteorder('='), copy=False)     #only copied on big-endian machines
+
+                results = np.empty(count, dtype=_RESULTS)
+                try:
+                    for i, row in enumerate(parameters):
+                        results[i] = _simulate_genome(player, simulate, Genome.view(row, structure))
+                except Exception:
+                    error = traceback.format_exc().encode('utf-8')
+                    connection.sendall(b'X' + _COUNT.pack(len(error)) + error)
+                    continue
+
+                connection.sendall(b'R' + _COUNT.pack(count) + results.tobytes())
+            case message_type:
+                raise ConnectionError(f"Unknown message type {message_type}.")
+
+
+def start_local_workers(player_factory: Callable[[], BasePlayer], simulate: Callable[[BasePlayer], BasePlayer], count: int) -> tuple[list[Process], list[tuple[str, int]]]:
+    """Start count remote workers as processes on this machine and return them with their addresses.
+
+    Useful to test a RemoteExecutor, or to include this machine's cores alongside remote ones.
+    """
+
+    ready = ProcessQueue()
+    processes = [Process(target=serve, args=(player_factory, simulate, '127.0.0.1', 0, ready), daemon=True) for _ in range(count)]
+    for process in processes:
+        process.start()
+
+    return processes, [('127.0.0.1', ready.get()) for _ in processes]
+
+
+class RemoteError(Exception):
+    """A simulation raised an error on a remote worker."""
+
+
+class RemoteExecutor(Executor):
+    """Simulates Genomes on remote workers (see serve), each reached over its own TCP connection.
+
+    Genomes are sent in chunks of chunksize as raw parameters and only fitness, score and best score are sent back.
+    Each connection takes the next chunk as soon as it has finished its last, so faster machines take on more of the work.
+    If a worker fails (its connection drops, or it doesn't reply to a chunk within timeout seconds) the chunk it was
+    simulating is re-sent to another, and the failed worker is dropped. The timeout is a read deadline set on each
+    connection, so a worker that vanishes without closing its connection (e.g. it loses power or the network is
+    partitioned) is caught too. It must be longer than the slowest chunk takes to simulate, or None to wait forever.
+    An error raised by the simulation itself is raised as a RemoteError.
+    Scores are sent back as integers. The busy seconds of each worker include the time taken to send it its chunks.
+    """
+
+    def __init__(self, addresses: list[tuple[str, int]], chunksize: int = 32, timeout: float | None = 300.0) -> None:
+        self.addresses = list(addresses)
+        self.chunksize = chunksize
+        self.timeout = timeout
+        self.connections = []
+        for address in self.addresses:
+            connection = socket.create_connection(address, timeout)
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection.settimeout(timeout)  #a reply taking longer raises TimeoutError, an OSError, so the worker is dropped
+            self.connections.append(connection)
+        self.structures = [None] * len(self.connections)    #the structure each worker was last sent
+        self.lock = threading.Lock()
+        self.busy_seconds = 0.0
+
+    @property
+    def workers(self) -> int:
+        """Number of workers that haven't failed."""
+        return sum(connection is not None for connection in self.connections)
+
+    def simulate(self, population: Population, indices: list[int]) -> list[tuple[float, int, int]]:
+
+        if population.parameters is not None:
+            population.sync_parameters()
+            parameters = population.parameters.array[indices]
+        else:
+            parameters = np.stack([population.players[i].genome.flat_parameters() for i in indices])
+        structure = population.players[indices[0]].genome.structure
+
+        chunks = Queue()
+        for start in range(0, len(parameters), self.chunksize):
+            chunks.put((start, min(start + self.chunksize, len(parameters))))
+        results = np.empty(len(parameters), dtype=RESULT_DTYPE)
+        errors = []
+
+        #keep going while there are chunks left, which can happen if a worker fails after the others have run out
+        while not chunks.empty():
+            if not any(self.connections):
+                raise Exception("Every remote worker has failed.")
+
+            threads = [threading.Thread(target=self._run_chunks, args=(worker, chunks, parameters, structure, results, errors))
+                       for worker, connection in enumerate(self.connections) if connection is not None]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            if errors:
+                raise RemoteError(errors[0])
+
+        return results.tolist()
+
+    def _run_chunks(self, worker: int, chunks: Queue, parameters: np.ndarray, structure: tuple[tuple[int,str]],
+                    results: np.ndarray, errors: list[str]) -> None:
+        """Send chunks to the worker until there are none left, putting back the current chunk if the worker fails."""
+
+        connection = self.connections[worker]
+        while not errors:
+            try:
+                start, stop = chunks.get_nowait()
+            except Empty:
+                return
+
+            try:
+                sent = time.perf_counter()
+                if self.structures[worker] != structure:
+                    connection.sendall(_encode_structure(structure))
+                    self.structures[worker] = structure
+
+                chunk = np.ascontiguousarray(parameters[start:stop], dtype=parameters.dtype.newbyteorder('<'))
+                connection.sendall(b'E' + _EVALUATE.pack(chunk.dtype.char.encode('ascii'), len(chunk), chunk.shape[1]))
+                connection.sendall(chunk.data)
+
+                match(_HEADER.unpack(_receive(connection, _HEADER.size))[0]):
+                    case b'R':
+                        count, = _COUNT.unpack(_receive(connection, _COUNT.size))
+                        results[start:stop] = np.frombuffer(_receive(connection, count * _RESULTS.itemsize), dtype=_RESULTS)
+                        with self.lock:
+                            self.busy_seconds += time.perf_counter() - sent
+                    case b'X':
+                        length, = _COUNT.unpack(_receive(connection, _COUNT.size))
+                        errors.append(_receive(connection, length).decode('utf-8'))
+                    case message_type:
+                        raise ConnectionError(f"Unknown message type {message_type}.")
+
+            except OSError:
+                chunks.put((start, stop))
+                connection.close()
+                self.connections[worker] = None
+                return
+            except Exception:
+                errors.append(traceback.format_exc())
+
+    def close(self) -> None:
+        for connection in self.connections:
+            if connection is not None:
+                connection.close()
+        self.connections = [None] * len(self.connections)